@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['role', '-date_joined', '-id'], name='user_role_joined'),
+        ),
+    ]
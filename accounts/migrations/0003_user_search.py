@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from accounts.search import install_user_search, uninstall_user_search
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_user_search, uninstall_user_search),
+    ]
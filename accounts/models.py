@@ -18,5 +18,12 @@ class CustomUser(AbstractUser):
     profile_picture = models.ImageField(upload_to='profiles/', blank=True, null=True)
     is_approved = models.BooleanField(default=False, help_text="For planners/guests only")
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['role', '-date_joined', '-id'], name='user_role_joined'),
+            # Admin dashboard: sign-ups in the last RECENT_REGISTRATION_DAYS, counted on read
+            models.Index(fields=['date_joined'], name='user_joined'),
+        ]
+
     def __str__(self):
         return self.username
\ No newline at end of file
@@ -0,0 +1,179 @@
+"""
+Admin search over CustomUser.username, full_name, email and mobile_number.
+
+Input that looks like an e-mail address or a phone number is matched as a
+prefix of that column through a B-tree index on lower(email) or
+mobile_number. Anything else is free text: SQLite keeps an external-content
+FTS5 table (accounts_customuser_fts) in sync with accounts_customuser through
+triggers, PostgreSQL uses a GIN index on a tsvector expression, and other
+backends fall back to icontains. As with host.search, a migration that makes
+SQLite rebuild accounts_customuser drops the triggers and indexes, so it
+must call install_user_search again.
+"""
+import re
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+SQLITE_SEARCH_INSTALL = [
+    "CREATE INDEX IF NOT EXISTS user_email_lower ON accounts_customuser (lower(email))",
+    "CREATE INDEX IF NOT EXISTS user_mobile ON accounts_customuser (mobile_number)",
+    # prefix='2 3' keeps short "jo"* style prefix queries on the index
+    """CREATE VIRTUAL TABLE IF NOT EXISTS accounts_customuser_fts
+       USING fts5(username, full_name, email, mobile_number,
+                  content='accounts_customuser', content_rowid='id', prefix='2 3')""",
+    """CREATE TRIGGER IF NOT EXISTS accounts_customuser_fts_ai AFTER INSERT ON accounts_customuser BEGIN
+           INSERT INTO accounts_customuser_fts(rowid, username, full_name, email, mobile_number)
+           VALUES (new.id, new.username, new.full_name, new.email, new.mobile_number);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS accounts_customuser_fts_ad AFTER DELETE ON accounts_customuser BEGIN
+           INSERT INTO accounts_customuser_fts(accounts_customuser_fts, rowid, username, full_name, email, mobile_number)
+           VALUES ('delete', old.id, old.username, old.full_name, old.email, old.mobile_number);
+       END""",
+    # Model saves write every column; only reindex when a searched one changed
+    """CREATE TRIGGER IF NOT EXISTS accounts_customuser_fts_au
+       AFTER UPDATE OF username, full_name, email, mobile_number ON accounts_customuser
+       WHEN old.username IS NOT new.username OR old.full_name IS NOT new.full_name
+            OR old.email IS NOT new.email OR old.mobile_number IS NOT new.mobile_number
+       BEGIN
+           INSERT INTO accounts_customuser_fts(accounts_customuser_fts, rowid, username, full_name, email, mobile_number)
+           VALUES ('delete', old.id, old.username, old.full_name, old.email, old.mobile_number);
+           INSERT INTO accounts_customuser_fts(rowid, username, full_name, email, mobile_number)
+           VALUES (new.id, new.username, new.full_name, new.email, new.mobile_number);
+       END""",
+    "INSERT INTO accounts_customuser_fts(accounts_customuser_fts) VALUES ('rebuild')",
+]
+
+SQLITE_SEARCH_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS accounts_customuser_fts_ai",
+    "DROP TRIGGER IF EXISTS accounts_customuser_fts_ad",
+    "DROP TRIGGER IF EXISTS accounts_customuser_fts_au",
+    "DROP TABLE IF EXISTS accounts_customuser_fts",
+    "DROP INDEX IF EXISTS user_mobile",
+    "DROP INDEX IF EXISTS user_email_lower",
+]
+
+POSTGRES_TSVECTOR = (
+    "to_tsvector('simple', coalesce(accounts_customuser.username, '') || ' ' || "
+    "coalesce(accounts_customuser.full_name, '') || ' ' || "
+    "coalesce(accounts_customuser.email, '') || ' ' || "
+    "coalesce(accounts_customuser.mobile_number, ''))"
+)
+
+POSTGRES_SEARCH_INSTALL = [
+    # text_pattern_ops lets LIKE 'prefix%' use the index under any collation
+    "CREATE INDEX IF NOT EXISTS user_email_lower ON accounts_customuser (lower(email) text_pattern_ops)",
+    "CREATE INDEX IF NOT EXISTS user_mobile ON accounts_customuser (mobile_number text_pattern_ops)",
+    f"CREATE INDEX IF NOT EXISTS accounts_customuser_fts_idx ON accounts_customuser USING GIN ({POSTGRES_TSVECTOR})",
+]
+
+POSTGRES_SEARCH_UNINSTALL = [
+    "DROP INDEX IF EXISTS accounts_customuser_fts_idx",
+    "DROP INDEX IF EXISTS user_mobile",
+    "DROP INDEX IF EXISTS user_email_lower",
+]
+
+# Searched columns, keyed by prefix kind: the SQL expression the index is built on
+PREFIX_COLUMNS = {
+    'email': 'lower(accounts_customuser.email)',
+    'mobile': 'accounts_customuser.mobile_number',
+}
+
+
+def _run(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def install_user_search(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_SEARCH_INSTALL)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_SEARCH_INSTALL)
+
+
+def uninstall_user_search(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_SEARCH_UNINSTALL)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_SEARCH_UNINSTALL)
+
+
+def classify_query(text):
+    """
+    Return (kind, term): ('email', prefix) for input containing '@',
+    ('mobile', digits) for phone-like input, ('text', words) otherwise,
+    or (None, None) when there is nothing to search for.
+    """
+    text = (text or '').strip()
+    if '@' in text:
+        return 'email', text.lower()
+    if re.fullmatch(r'\+?[\d\s-]*\d[\d\s-]*', text):
+        return 'mobile', re.sub(r'\D', '', text)
+    words = re.findall(r'\w+', text)
+    if words:
+        return 'text', words
+    return None, None
+
+
+def _prefix_filter(queryset, kind, prefix):
+    vendor = connections[queryset.db].vendor
+    column = PREFIX_COLUMNS[kind]
+    if vendor == 'sqlite':
+        # SQLite's LIKE is case-insensitive and cannot use a binary index, a range can
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return queryset.extra(where=[f'{column} >= %s', f'{column} < %s'], params=[prefix, upper])
+    if vendor == 'postgresql':
+        escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return queryset.extra(where=[f'{column} LIKE %s'], params=[escaped + '%'])
+    field = 'email' if kind == 'email' else 'mobile_number'
+    return queryset.filter(**{f'{field}__istartswith': prefix})
+
+
+def _role_filter(queryset, role):
+    if connections[queryset.db].vendor == 'sqlite':
+        # Unary + keeps SQLite off user_role_joined: without ANALYZE statistics it
+        # would walk every user of the role instead of the far narrower search index
+        return queryset.extra(where=['+accounts_customuser.role = %s'], params=[role])
+    return queryset.filter(role=role)
+
+
+def search_users(queryset, text, role=None):
+    """
+    Filter a CustomUser queryset to rows matching `text` (see classify_query),
+    and to `role` if given. Pass the role here rather than filtering on it
+    first, so the search index stays the one that drives the query.
+    """
+    kind, term = classify_query(text)
+    if kind is None:
+        return queryset.filter(role=role) if role else queryset
+    if role:
+        queryset = _role_filter(queryset, role)
+    if kind != 'text':
+        return _prefix_filter(queryset, kind, term)
+
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        # Prefix match on every word: "jo"* "gmail"*
+        match = ' '.join(f'"{word}"*' for word in term)
+        return queryset.filter(
+            id__in=RawSQL(
+                'SELECT rowid FROM accounts_customuser_fts WHERE accounts_customuser_fts MATCH %s', [match]
+            )
+        )
+    if vendor == 'postgresql':
+        return queryset.extra(
+            where=[f"{POSTGRES_TSVECTOR} @@ to_tsquery('simple', %s)"],
+            params=[' & '.join(f'{word}:*' for word in term)],
+        )
+
+    condition = Q()
+    for word in term:
+        condition &= (
+            Q(username__icontains=word) | Q(full_name__icontains=word)
+            | Q(email__icontains=word) | Q(mobile_number__icontains=word)
+        )
+    return queryset.filter(condition)
@@ -0,0 +1,72 @@
+"""
+Writing to the append-only Activity feed.
+
+Signal handlers log single changes with log_activity; code that changes
+many rows at once (bulk UPDATEs bypass signals) builds Activity objects
+and passes them to log_activities for one INSERT. archive_activities moves
+rows past the retention window into one gzipped NDJSON file per month, so
+the table (and the feed's index) only holds recent history.
+"""
+import gzip
+import json
+import os
+
+from django.db import transaction
+
+from .models import Activity
+
+SUMMARY_LENGTH = Activity._meta.get_field('summary').max_length
+
+# Days of activity kept in the table by archive_activities.
+ACTIVITY_RETENTION_DAYS = 90
+ARCHIVE_BATCH_SIZE = 5000
+ARCHIVE_FIELDS = ('id', 'created_at', 'kind', 'actor_id', 'object_id', 'summary')
+
+
+def _truncate(summary):
+    return summary if len(summary) <= SUMMARY_LENGTH else summary[:SUMMARY_LENGTH - 1] + '…'
+
+
+def activity(kind, summary, actor_id=None, object_id=None):
+    """An unsaved Activity row, for log_activities."""
+    return Activity(kind=kind, summary=_truncate(summary), actor_id=actor_id, object_id=object_id)
+
+
+def log_activity(kind, summary, actor_id=None, object_id=None):
+    Activity.objects.create(kind=kind, summary=_truncate(summary), actor_id=actor_id, object_id=object_id)
+
+
+def log_activities(rows):
+    Activity.objects.bulk_create(rows, batch_size=1000)
+
+
+def archive_activities(before, archive_dir, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Move rows created before `before` to `archive_dir`/activity-YYYY-MM.ndjson.gz,
+    oldest first, one batch at a time. Each batch is written and flushed before
+    it is deleted, so an interrupted run can at worst archive a batch twice.
+    Returns {month: rows archived}.
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    archived = {}
+    while True:
+        rows = list(
+            Activity.objects.filter(created_at__lt=before)
+            .order_by('created_at', 'id')
+            .values(*ARCHIVE_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return archived
+
+        by_month = {}
+        for row in rows:
+            by_month.setdefault(row['created_at'].strftime('%Y-%m'), []).append(row)
+        for month, month_rows in by_month.items():
+            # Appending adds a gzip member; readers see one continuous stream
+            with gzip.open(os.path.join(archive_dir, f'activity-{month}.ndjson.gz'), 'at') as fh:
+                for row in month_rows:
+                    fh.write(json.dumps({**row, 'created_at': row['created_at'].isoformat()}) + '\n')
+            archived[month] = archived.get(month, 0) + len(month_rows)
+
+        with transaction.atomic():
+            Activity.objects.filter(pk__in=[row['id'] for row in rows]).delete()
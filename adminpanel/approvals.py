@@ -0,0 +1,68 @@
+"""
+Approving and rejecting pending signups in bulk.
+
+Guests and planners register inactive and wait for an admin. Decisions on
+any number of them take one UPDATE (approve) or one queryset DELETE
+(reject), and the notification mails are sent after commit over a single
+SMTP connection.
+"""
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+
+from accounts.models import CustomUser
+from .activity import activity, log_activities
+from .stats import adjust_platform_stats
+
+APPROVED_SUBJECT = 'EventApp Account Approved'
+APPROVED_BODY = 'Your registration has been approved. You can now log in to the platform.'
+REJECTED_SUBJECT = 'EventApp Account Rejected'
+REJECTED_BODY = 'Your registration has been rejected. Please contact support for more details.'
+
+
+def pending_signups():
+    return CustomUser.objects.filter(role__in=['guest', 'planner'], is_approved=False)
+
+
+def send_bulk_mail(subject, body, recipients):
+    """Send one message per recipient over a single connection; returns how many went out."""
+    if not recipients:
+        return 0
+    connection = get_connection(fail_silently=True)
+    messages = [
+        EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [email], connection=connection)
+        for email in recipients
+    ]
+    return connection.send_messages(messages) or 0
+
+
+def approve_signups(queryset, admin=None):
+    """
+    Approve the pending signups in `queryset`. Returns (approved, mailed).
+    The UPDATE bypasses the stats and activity signals, so the pending count
+    is adjusted and the activity rows are written here.
+    """
+    with transaction.atomic():
+        rows = list(
+            queryset.filter(pk__in=pending_signups()).select_for_update()
+            .values_list('pk', 'username', 'email', 'is_active')
+        )
+        approved = CustomUser.objects.filter(pk__in=[row[0] for row in rows]).update(is_approved=True, is_active=True)
+        adjust_platform_stats(pending_approvals=-sum(1 for *_, is_active in rows if not is_active))
+        log_activities([
+            activity('user_approved', f'{username} was approved', actor_id=admin and admin.pk, object_id=pk)
+            for pk, username, _, _ in rows
+        ])
+    return approved, send_bulk_mail(APPROVED_SUBJECT, APPROVED_BODY, [row[2] for row in rows if row[2]])
+
+
+def reject_signups(queryset, admin=None):
+    """Delete the pending signups in `queryset` and tell them. Returns (rejected, mailed)."""
+    with transaction.atomic():
+        rows = list(queryset.filter(pk__in=pending_signups()).values_list('pk', 'username', 'email'))
+        CustomUser.objects.filter(pk__in=[pk for pk, _, _ in rows]).delete()
+        log_activities([
+            activity('user_rejected', f'{username} was rejected', actor_id=admin and admin.pk, object_id=pk)
+            for pk, username, _ in rows
+        ])
+    return len(rows), send_bulk_mail(REJECTED_SUBJECT, REJECTED_BODY, [email for _, _, email in rows if email])
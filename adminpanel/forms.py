@@ -1,4 +1,7 @@
+from datetime import datetime, time, timedelta
+
 from django import forms
+from django.utils import timezone
 from accounts.models import CustomUser
 
 class UserEditForm(forms.ModelForm):
@@ -17,4 +20,42 @@ class UserEditForm(forms.ModelForm):
         if mobile:
             if not mobile.isdigit() or len(mobile) != 10 or mobile[0] not in '6789':
                 raise forms.ValidationError('Mobile number must be exactly 10 digits starting with 6, 7, 8, or 9.')
-        return mobile
\ No newline at end of file
+        return mobile
+
+
+class AdminEventFilterForm(forms.Form):
+    """Admin event list filters; each maps onto an indexed Event column."""
+    STATUS_CHOICES = [
+        ('', 'All statuses'),
+        ('pending', 'Awaiting proposal'),
+        ('accepted', 'Proposal accepted'),
+    ]
+    status = forms.ChoiceField(choices=STATUS_CHOICES, required=False)
+    date_from = forms.DateField(required=False, label='Starts from', widget=forms.DateInput(attrs={'type': 'date'}))
+    date_to = forms.DateField(required=False, label='Starts until', widget=forms.DateInput(attrs={'type': 'date'}))
+    host = forms.ModelChoiceField(
+        queryset=CustomUser.objects.filter(role='host').order_by('full_name'),
+        required=False,
+        empty_label='All hosts',
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in ('status', 'host'):
+            self.fields[name].widget.attrs['class'] = 'form-select'
+        for name in ('date_from', 'date_to'):
+            self.fields[name].widget.attrs['class'] = 'form-control'
+
+    def filter_queryset(self, queryset):
+        """Apply the cleaned filters to an Event queryset (call after is_valid())."""
+        data = self.cleaned_data
+        if data.get('status'):
+            # is_published is the denormalized "has an accepted proposal" flag
+            queryset = queryset.filter(is_published=data['status'] == 'accepted')
+        if data.get('date_from'):
+            queryset = queryset.filter(start_date__gte=timezone.make_aware(datetime.combine(data['date_from'], time.min)))
+        if data.get('date_to'):
+            queryset = queryset.filter(start_date__lt=timezone.make_aware(datetime.combine(data['date_to'] + timedelta(days=1), time.min)))
+        if data.get('host'):
+            queryset = queryset.filter(host=data['host'])
+        return queryset
\ No newline at end of file
@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from adminpanel.activity import ACTIVITY_RETENTION_DAYS, ARCHIVE_BATCH_SIZE, archive_activities
+
+
+class Command(BaseCommand):
+    help = 'Move activity feed rows older than the retention window into monthly gzipped NDJSON files.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=ACTIVITY_RETENTION_DAYS,
+                            help=f'Days of activity to keep in the table (default: {ACTIVITY_RETENTION_DAYS}).')
+        parser.add_argument('--archive-dir', default=str(settings.BASE_DIR / 'archive' / 'activity'),
+                            help='Directory for the monthly archive files (default: archive/activity).')
+        parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE,
+                            help=f'Rows moved per batch (default: {ARCHIVE_BATCH_SIZE}).')
+
+    def handle(self, *args, **options):
+        if options['days'] < 0 or options['batch_size'] <= 0:
+            raise CommandError('--days must not be negative and --batch-size must be positive.')
+
+        before = timezone.now() - timedelta(days=options['days'])
+        archived = archive_activities(before, options['archive_dir'], batch_size=options['batch_size'])
+        for month, count in sorted(archived.items()):
+            self.stdout.write(f'{month}: archived {count} rows')
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {sum(archived.values())} activity rows older than {options['days']} days."
+        ))
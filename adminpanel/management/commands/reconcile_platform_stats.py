@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from adminpanel.stats import reconcile_platform_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the admin dashboard stats snapshot from the source tables now (the dashboard does it daily).'
+
+    def handle(self, *args, **options):
+        stats = reconcile_platform_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f'Platform stats reconciled: {stats.total_users} users, {stats.total_events} events, '
+            f'{stats.total_tickets} tickets.'
+        ))
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_users', models.IntegerField(default=0)),
+                ('total_hosts', models.IntegerField(default=0)),
+                ('total_guests', models.IntegerField(default=0)),
+                ('total_planners', models.IntegerField(default=0)),
+                ('pending_approvals', models.IntegerField(default=0)),
+                ('recent_registrations', models.IntegerField(default=0)),
+                ('total_events', models.IntegerField(default=0)),
+                ('total_tickets', models.IntegerField(default=0)),
+                ('reconciled_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:59
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adminpanel', '0002_daily_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Activity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('kind', models.CharField(choices=[('user_registered', 'User registered'), ('user_approved', 'User approved'), ('user_rejected', 'User rejected'), ('event_created', 'Event created'), ('proposal_submitted', 'Proposal submitted'), ('proposal_accepted', 'Proposal accepted'), ('proposal_rejected', 'Proposal rejected'), ('booking_confirmed', 'Booking confirmed'), ('booking_cancelled', 'Booking cancelled'), ('checkin', 'Guest checked in')], max_length=20)),
+                ('actor_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('object_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('summary', models.CharField(max_length=200)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-created_at', '-id'], name='activity_created'), models.Index(fields=['kind', '-created_at', '-id'], name='activity_kind_created')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:39
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adminpanel', '0003_activity_log'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='platformstats',
+            name='recent_registrations',
+        ),
+    ]
@@ -1,3 +1,122 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 # Create your models here.
+
+
+class PlatformStats(models.Model):
+    """
+    Single-row snapshot of the admin dashboard figures. Signals apply
+    atomic increments as users, events and bookings change, and
+    reconcile_platform_stats recomputes it from scratch to correct drift
+    from bulk updates, which bypass signals. Recent registrations are a
+    moving window and are counted on read instead (see stats).
+    """
+    SINGLETON_ID = 1
+
+    total_users = models.IntegerField(default=0)
+    total_hosts = models.IntegerField(default=0)
+    total_guests = models.IntegerField(default=0)
+    total_planners = models.IntegerField(default=0)
+    pending_approvals = models.IntegerField(default=0)
+    total_events = models.IntegerField(default=0)
+    total_tickets = models.IntegerField(default=0)  # tickets on confirmed bookings
+    reconciled_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Platform stats (reconciled {self.reconciled_at})"
+
+
+class DailyStats(models.Model):
+    """Platform-wide totals for one day, filled by the rollup_daily_stats command."""
+    day = models.DateField(unique=True)
+    bookings = models.IntegerField(default=0)  # confirmed bookings created that day
+    tickets = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    registrations = models.IntegerField(default=0)
+    proposals = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"Stats for {self.day}"
+
+
+class HostDailyStats(models.Model):
+    """One host's daily totals across their events."""
+    host = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='daily_stats')
+    day = models.DateField()
+    bookings = models.IntegerField(default=0)
+    tickets = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    proposals = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['host', 'day'], name='unique_host_daily_stats'),
+        ]
+
+    def __str__(self):
+        return f"Stats for host {self.host_id} on {self.day}"
+
+
+class EventDailyStats(models.Model):
+    """One event's daily totals."""
+    event = models.ForeignKey('host.Event', on_delete=models.CASCADE, related_name='daily_stats')
+    day = models.DateField()
+    bookings = models.IntegerField(default=0)
+    tickets = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    proposals = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'day'], name='unique_event_daily_stats'),
+        ]
+
+    def __str__(self):
+        return f"Stats for event {self.event_id} on {self.day}"
+
+
+class RollupWatermark(models.Model):
+    """Highest source row id already folded into the daily rollups, per source table."""
+    source = models.CharField(max_length=50, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.source} rolled up to id {self.last_id}"
+
+
+class Activity(models.Model):
+    """
+    Append-only platform activity feed shown in ActivitiesView. Rows are
+    never updated; actor and object are bare ids so entries outlive the
+    rows they describe. Old rows are moved out by archive_activities.
+    """
+    KIND_CHOICES = [
+        ('user_registered', 'User registered'),
+        ('user_approved', 'User approved'),
+        ('user_rejected', 'User rejected'),
+        ('event_created', 'Event created'),
+        ('proposal_submitted', 'Proposal submitted'),
+        ('proposal_accepted', 'Proposal accepted'),
+        ('proposal_rejected', 'Proposal rejected'),
+        ('booking_confirmed', 'Booking confirmed'),
+        ('booking_cancelled', 'Booking cancelled'),
+        ('checkin', 'Guest checked in'),
+    ]
+    created_at = models.DateTimeField(default=timezone.now)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    actor_id = models.PositiveIntegerField(null=True, blank=True)
+    object_id = models.PositiveIntegerField(null=True, blank=True)
+    summary = models.CharField(max_length=200)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='activity_created'),
+            models.Index(fields=['kind', '-created_at', '-id'], name='activity_kind_created'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} at {self.created_at}: {self.summary}"
@@ -0,0 +1,237 @@
+"""
+Daily rollups of bookings, revenue, registrations and proposals.
+
+rollup_daily_stats folds source rows into DailyStats, HostDailyStats and
+EventDailyStats. Each source keeps a RollupWatermark (the highest id
+already counted), so a run only reads rows added since the previous one,
+in id-ordered chunks that commit together with their watermark.
+
+Rows younger than SETTLE_MINUTES are left for a later run. Bookings count
+once confirmed, so the bookings watermark also stops below the oldest
+booking still awaiting payment, for up to PENDING_GRACE_DAYS; after that
+the booking is treated as abandoned. A booking that changes after the
+watermark has passed it (cancelled, deleted, or confirmed after its grace
+period) is moved in or out of its day's rollups by the Booking signals via
+adjust_booking_rollups. Bulk updates bypass those signals; rollup_daily_stats
+--rebuild recomputes everything from the tables.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from guest.models import Booking
+from host.models import Event, Proposal
+from .models import DailyStats, EventDailyStats, HostDailyStats, RollupWatermark
+
+ROLLUP_CHUNK_SIZE = 50000
+SETTLE_MINUTES = 60
+# How long a pending booking holds back the bookings watermark
+PENDING_GRACE_DAYS = 7
+
+# Longest range a chart endpoint will return
+MAX_CHART_DAYS = 366
+
+ROLLUP_MODELS = (DailyStats, HostDailyStats, EventDailyStats)
+
+
+def _booking_rows(low, high):
+    return (
+        Booking.objects.filter(id__gt=low, id__lte=high, status='confirmed')
+        .annotate(day=TruncDate('created_at'), host_id=F('event__host_id'))
+        .values('day', 'event_id', 'host_id')
+        .annotate(bookings=Count('id'), tickets=Sum('ticket_quantity'), revenue=Sum('total_amount'))
+    )
+
+
+def _booking_hold(now):
+    """Highest bookings id safe to pass: just below the oldest booking still awaiting payment."""
+    oldest_pending = (
+        Booking.objects.filter(status='pending', created_at__gte=now - timedelta(days=PENDING_GRACE_DAYS))
+        .order_by('id').values_list('id', flat=True).first()
+    )
+    return oldest_pending - 1 if oldest_pending else None
+
+
+def _registration_rows(low, high):
+    return (
+        CustomUser.objects.filter(id__gt=low, id__lte=high)
+        .annotate(day=TruncDate('date_joined'))
+        .values('day')
+        .annotate(registrations=Count('id'))
+    )
+
+
+def _proposal_rows(low, high):
+    return (
+        Proposal.objects.filter(id__gt=low, id__lte=high)
+        .annotate(day=TruncDate('created_at'), host_id=F('event__host_id'))
+        .values('day', 'event_id', 'host_id')
+        .annotate(proposals=Count('id'))
+    )
+
+
+# source name -> (model, timestamp field, grouped rows for an id range, optional id ceiling)
+SOURCES = {
+    'bookings': (Booking, 'created_at', _booking_rows, _booking_hold),
+    'registrations': (CustomUser, 'date_joined', _registration_rows, None),
+    'proposals': (Proposal, 'created_at', _proposal_rows, None),
+}
+
+
+def _accumulate(model, key_field, deltas):
+    """
+    Add {(key, day): {metric: delta}} into `model`: one read of the affected
+    rows, then one bulk_update and one bulk_create.
+    """
+    if not deltas:
+        return
+    lookup = {'day__in': {day for _, day in deltas}}
+    if key_field:
+        lookup[f'{key_field}__in'] = {key for key, _ in deltas}
+    existing = {
+        (getattr(row, key_field) if key_field else None, row.day): row
+        for row in model.objects.filter(**lookup)
+    }
+
+    metrics = set()
+    to_create, to_update = [], []
+    for (key, day), values in deltas.items():
+        metrics.update(values)
+        row = existing.get((key, day))
+        if row is None:
+            row = model(day=day, **({key_field: key} if key_field else {}))
+            to_create.append(row)
+        else:
+            to_update.append(row)
+        for metric, delta in values.items():
+            setattr(row, metric, getattr(row, metric) + delta)
+
+    model.objects.bulk_update(to_update, sorted(metrics), batch_size=1000)
+    model.objects.bulk_create(to_create, batch_size=1000)
+
+
+def _fold(rows):
+    """Split grouped source rows into per-platform, per-host and per-event deltas."""
+    platform = defaultdict(lambda: defaultdict(int))
+    per_host = defaultdict(lambda: defaultdict(int))
+    per_event = defaultdict(lambda: defaultdict(int))
+    for row in rows:
+        day = row.pop('day')
+        event_id = row.pop('event_id', None)
+        host_id = row.pop('host_id', None)
+        for metric, value in row.items():
+            value = value or 0
+            platform[(None, day)][metric] += value
+            if host_id is not None:
+                per_host[(host_id, day)][metric] += value
+            if event_id is not None:
+                per_event[(event_id, day)][metric] += value
+    return platform, per_host, per_event
+
+
+def rollup_source(name, chunk_size=ROLLUP_CHUNK_SIZE):
+    """Fold rows of one source added since its watermark; returns source rows covered."""
+    model, timestamp_field, grouped_rows, hold = SOURCES[name]
+    now = timezone.now()
+    cutoff = now - timedelta(minutes=SETTLE_MINUTES)
+    # Highest id that is old enough to be final; walks back from the newest row only
+    settled = (
+        model.objects.filter(**{f'{timestamp_field}__lt': cutoff})
+        .order_by('-id').values_list('id', flat=True).first()
+    ) or 0
+    ceiling = hold(now) if hold else None
+    if ceiling is not None:
+        settled = min(settled, ceiling)
+
+    covered = 0
+    while True:
+        with transaction.atomic():
+            watermark, _ = RollupWatermark.objects.select_for_update().get_or_create(source=name)
+            low = watermark.last_id
+            if low >= settled:
+                return covered
+            high = min(low + chunk_size, settled)
+
+            platform, per_host, per_event = _fold(list(grouped_rows(low, high)))
+            _accumulate(DailyStats, None, platform)
+            _accumulate(HostDailyStats, 'host_id', per_host)
+            _accumulate(EventDailyStats, 'event_id', per_event)
+
+            watermark.last_id = high
+            watermark.save(update_fields=['last_id', 'updated_at'])
+            covered += high - low
+
+
+def rollup_all(rebuild=False, chunk_size=ROLLUP_CHUNK_SIZE):
+    """Run every source; with rebuild, drop the rollups and start from id 0."""
+    if rebuild:
+        with transaction.atomic():
+            for model in ROLLUP_MODELS:
+                model.objects.all().delete()
+            RollupWatermark.objects.all().delete()
+    return {name: rollup_source(name, chunk_size) for name in SOURCES}
+
+
+def booking_contribution(status, tickets, amount):
+    """(bookings, tickets, revenue) a booking adds to the rollups: only confirmed ones count."""
+    return (1, tickets, amount) if status == 'confirmed' else (0, 0, 0)
+
+
+def adjust_booking_rollups(booking, old, new, create=True):
+    """
+    Move an already counted booking's day from contribution `old` to `new`.
+    Bookings above the bookings watermark are skipped; the next run reads
+    them as they are then. With create=False missing rollup rows are left
+    alone, so a cascade delete never recreates a row for its parent.
+    """
+    deltas = {metric: after - before for metric, before, after in zip(('bookings', 'tickets', 'revenue'), old, new)}
+    deltas = {metric: delta for metric, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    day = timezone.localdate(booking.created_at)
+    with transaction.atomic():
+        counted = (
+            RollupWatermark.objects.select_for_update()
+            .filter(source='bookings', last_id__gte=booking.pk).exists()
+        )
+        if not counted:
+            return
+        host_id = Event.objects.filter(pk=booking.event_id).values_list('host_id', flat=True).first()
+        targets = [(DailyStats, {}), (EventDailyStats, {'event_id': booking.event_id})]
+        if host_id is not None:
+            targets.append((HostDailyStats, {'host_id': host_id}))
+        for model, key in targets:
+            updated = model.objects.filter(day=day, **key).update(
+                **{metric: F(metric) + delta for metric, delta in deltas.items()}
+            )
+            if not updated and create:
+                model.objects.create(day=day, **key, **deltas)
+
+
+def daily_series(queryset, metrics, days):
+    """
+    Chart data for the last `days` days from a rollup queryset:
+    {'labels': [...], metric: [...], ...} with missing days as zero.
+    """
+    days = max(1, min(days, MAX_CHART_DAYS))
+    today = timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    totals = defaultdict(lambda: defaultdict(int))
+    for row in queryset.filter(day__gte=start).values('day', *metrics):
+        for metric in metrics:
+            totals[row['day']][metric] += row[metric]
+
+    labels = [start + timedelta(days=offset) for offset in range(days)]
+    series = {'labels': [day.isoformat() for day in labels]}
+    for metric in metrics:
+        series[metric] = [
+            float(totals[day][metric]) if isinstance(totals[day][metric], Decimal) else totals[day][metric]
+            for day in labels
+        ]
+    return series
@@ -0,0 +1,139 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .activity import log_activity
+from .rollups import adjust_booking_rollups, booking_contribution
+from .stats import adjust_platform_stats, booking_tickets, user_stats_deltas, user_stats_state
+
+# Remember what each loaded instance looked like, so saves can be turned into
+# deltas without a query. Instances loaded with the relevant fields deferred
+# are marked UNKNOWN (reading them would cost a query per row) and their
+# changes are left to the periodic reconcile.
+UNKNOWN = object()
+USER_STATS_FIELDS = {'role', 'is_approved', 'is_active'}
+BOOKING_STATS_FIELDS = {'status', 'ticket_quantity'}
+BOOKING_ROLLUP_FIELDS = {'status', 'ticket_quantity', 'total_amount', 'created_at', 'event'}
+
+# Proposal and booking status changes that are written to the activity feed
+PROPOSAL_STATUS_ACTIVITY = {'accepted': 'proposal_accepted', 'rejected': 'proposal_rejected'}
+BOOKING_STATUS_ACTIVITY = {'confirmed': 'booking_confirmed', 'cancelled': 'booking_cancelled'}
+
+
+@receiver(post_init, sender='accounts.CustomUser')
+def remember_user_state(sender, instance, **kwargs):
+    if instance.pk is None:
+        instance._stats_state = None
+    elif USER_STATS_FIELDS & instance.get_deferred_fields():
+        instance._stats_state = UNKNOWN
+    else:
+        instance._stats_state = user_stats_state(instance)
+
+
+@receiver(post_save, sender='accounts.CustomUser')
+def user_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or instance._stats_state is UNKNOWN:
+        return
+    new_state = user_stats_state(instance)
+    deltas = user_stats_deltas(None if created else instance._stats_state, new_state)
+    if created:
+        log_activity('user_registered', f'{instance.username} registered as {instance.role}',
+                     actor_id=instance.pk, object_id=instance.pk)
+    elif instance._stats_state and instance._stats_state[1] and not new_state[1] and instance.is_approved:
+        log_activity('user_approved', f'{instance.username} was approved', object_id=instance.pk)
+    adjust_platform_stats(**deltas)
+    instance._stats_state = new_state
+
+
+@receiver(post_delete, sender='accounts.CustomUser')
+def user_deleted(sender, instance, **kwargs):
+    if instance._stats_state is UNKNOWN:
+        return
+    adjust_platform_stats(**user_stats_deltas(instance._stats_state, None))
+
+
+@receiver(post_save, sender='host.Event')
+def event_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        adjust_platform_stats(total_events=1)
+        log_activity('event_created', f'{instance.host.username} created "{instance.name}"',
+                     actor_id=instance.host_id, object_id=instance.pk)
+
+
+@receiver(post_delete, sender='host.Event')
+def event_deleted(sender, instance, **kwargs):
+    adjust_platform_stats(total_events=-1)
+
+
+@receiver(post_init, sender='host.Proposal')
+def remember_proposal_status(sender, instance, **kwargs):
+    if instance.pk is None:
+        instance._activity_status = None
+    elif 'status' in instance.get_deferred_fields():
+        instance._activity_status = UNKNOWN
+    else:
+        instance._activity_status = instance.status
+
+
+@receiver(post_save, sender='host.Proposal')
+def proposal_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or instance._activity_status is UNKNOWN:
+        return
+    if created:
+        log_activity('proposal_submitted',
+                     f'{instance.planner.username} proposed ₹{instance.amount} for "{instance.event.name}"',
+                     actor_id=instance.planner_id, object_id=instance.pk)
+    elif instance.status != instance._activity_status and instance.status in PROPOSAL_STATUS_ACTIVITY:
+        log_activity(PROPOSAL_STATUS_ACTIVITY[instance.status],
+                     f'Proposal by {instance.planner.username} for "{instance.event.name}" {instance.status}',
+                     object_id=instance.pk)
+    instance._activity_status = instance.status
+
+
+@receiver(post_init, sender='guest.Booking')
+def remember_booking_state(sender, instance, **kwargs):
+    if instance.pk is None:
+        instance._stats_tickets = 0
+        instance._activity_status = None
+        instance._rollup_state = booking_contribution(None, 0, 0)
+        return
+    deferred = instance.get_deferred_fields()
+    if BOOKING_STATS_FIELDS & deferred:
+        instance._stats_tickets = UNKNOWN
+        instance._activity_status = UNKNOWN
+    else:
+        instance._stats_tickets = booking_tickets(instance)
+        instance._activity_status = instance.status
+    if BOOKING_ROLLUP_FIELDS & deferred:
+        instance._rollup_state = UNKNOWN
+    else:
+        instance._rollup_state = booking_contribution(instance.status, instance.ticket_quantity, instance.total_amount)
+
+
+@receiver(post_save, sender='guest.Booking')
+def booking_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    if instance._rollup_state is not UNKNOWN:
+        rollup_state = booking_contribution(instance.status, instance.ticket_quantity, instance.total_amount)
+        adjust_booking_rollups(instance, instance._rollup_state, rollup_state)
+        instance._rollup_state = rollup_state
+    if instance._stats_tickets is UNKNOWN:
+        return
+    tickets = booking_tickets(instance)
+    adjust_platform_stats(total_tickets=tickets - instance._stats_tickets)
+    instance._stats_tickets = tickets
+
+    if instance.status != instance._activity_status and instance.status in BOOKING_STATUS_ACTIVITY:
+        log_activity(BOOKING_STATUS_ACTIVITY[instance.status],
+                     f'{instance.guest.username}: {instance.ticket_quantity} ticket(s) for "{instance.event.name}" {instance.status}',
+                     actor_id=instance.guest_id, object_id=instance.pk)
+    instance._activity_status = instance.status
+
+
+@receiver(post_delete, sender='guest.Booking')
+def booking_deleted(sender, instance, **kwargs):
+    if instance._stats_tickets is not UNKNOWN:
+        adjust_platform_stats(total_tickets=-instance._stats_tickets)
+    if instance._rollup_state is not UNKNOWN:
+        # Cascades may have removed the rollup rows already; never recreate them
+        adjust_booking_rollups(instance, instance._rollup_state, booking_contribution(None, 0, 0), create=False)
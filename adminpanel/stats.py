@@ -0,0 +1,123 @@
+"""
+Upkeep of the PlatformStats row behind the admin dashboard.
+
+The dashboard reads one row. adjust_platform_stats applies deltas with a
+single UPDATE ... SET x = x + n, and reconcile_platform_stats rebuilds the
+row from the source tables. get_platform_stats reconciles by itself once
+the row is older than RECONCILE_AFTER; the reconcile_platform_stats
+command does the same on demand. Registrations in the last
+RECENT_REGISTRATION_DAYS are not stored, since the window moves on its
+own: they are counted on read through the user_joined index.
+"""
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from guest.models import Booking
+from host.models import Event
+from .models import PlatformStats
+
+RECENT_REGISTRATION_DAYS = 30
+
+# Age after which get_platform_stats rebuilds the row from the source tables
+RECONCILE_AFTER = timedelta(days=1)
+
+# Users who sign up as guests or planners wait inactive until an admin approves them
+APPROVAL_ROLES = ('guest', 'planner')
+
+
+def _totals():
+    now = timezone.now()
+    users = CustomUser.objects.aggregate(
+        total_users=Count('id'),
+        total_hosts=Count('id', filter=Q(role='host')),
+        total_guests=Count('id', filter=Q(role='guest')),
+        total_planners=Count('id', filter=Q(role='planner')),
+        pending_approvals=Count('id', filter=Q(role__in=APPROVAL_ROLES, is_approved=False, is_active=False)),
+    )
+    return {
+        **users,
+        'total_events': Event.objects.count(),
+        'total_tickets': Booking.objects.filter(status='confirmed').aggregate(total=Sum('ticket_quantity'))['total'] or 0,
+        'reconciled_at': now,
+    }
+
+
+def reconcile_platform_stats():
+    """Recompute every figure from the source tables and store it."""
+    stats, _ = PlatformStats.objects.update_or_create(pk=PlatformStats.SINGLETON_ID, defaults=_totals())
+    return stats
+
+
+def recent_registrations():
+    """Users who joined in the last RECENT_REGISTRATION_DAYS; a range count on user_joined."""
+    since = timezone.now() - timedelta(days=RECENT_REGISTRATION_DAYS)
+    return CustomUser.objects.filter(date_joined__gte=since).count()
+
+
+def _stats_row():
+    try:
+        stats = PlatformStats.objects.get(pk=PlatformStats.SINGLETON_ID)
+    except PlatformStats.DoesNotExist:
+        try:
+            with transaction.atomic():
+                return PlatformStats.objects.create(pk=PlatformStats.SINGLETON_ID, **_totals())
+        except IntegrityError:
+            stats = PlatformStats.objects.get(pk=PlatformStats.SINGLETON_ID)
+    if stats.reconciled_at is None or stats.reconciled_at < timezone.now() - RECONCILE_AFTER:
+        stats = reconcile_platform_stats()
+    return stats
+
+
+def get_platform_stats():
+    """
+    The stats row, built on first use and rebuilt once it is older than
+    RECONCILE_AFTER, with `recent_registrations` counted for this read.
+    """
+    stats = _stats_row()
+    stats.recent_registrations = recent_registrations()
+    return stats
+
+
+def adjust_platform_stats(**deltas):
+    """
+    Atomically add `deltas` (field name -> change) to the stats row. A no-op
+    until the row exists; it is seeded from the tables on first read.
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if deltas:
+        PlatformStats.objects.filter(pk=PlatformStats.SINGLETON_ID).update(
+            **{field: F(field) + delta for field, delta in deltas.items()}
+        )
+
+
+def user_stats_state(user):
+    """The parts of a user the stats depend on: (role, awaiting approval)."""
+    return (
+        user.role,
+        user.role in APPROVAL_ROLES and not user.is_approved and not user.is_active,
+    )
+
+
+def user_stats_deltas(old_state, new_state):
+    """Deltas for a user moving from old_state to new_state (None = not stored)."""
+    deltas = {}
+    for state, sign in ((old_state, -1), (new_state, 1)):
+        if state is None:
+            continue
+        role, pending = state
+        deltas['total_users'] = deltas.get('total_users', 0) + sign
+        field = {'host': 'total_hosts', 'guest': 'total_guests', 'planner': 'total_planners'}.get(role)
+        if field:
+            deltas[field] = deltas.get(field, 0) + sign
+        if pending:
+            deltas['pending_approvals'] = deltas.get('pending_approvals', 0) + sign
+    return deltas
+
+
+def booking_tickets(booking):
+    """Tickets a booking contributes to total_tickets."""
+    return booking.ticket_quantity if booking.status == 'confirmed' else 0
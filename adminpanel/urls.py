@@ -8,6 +8,7 @@ app_name = 'adminpanel'
 urlpatterns = [
     path('', views.AdminDashboardView.as_view(), name='dashboard'),
     path('pending-approvals/', views.PendingApprovalsView.as_view(), name='pending_approvals'),
+    path('users/search/', views.UserListView.as_view(), name='user_search'),
     path('users/<str:role>/', views.UserListView.as_view(), name='user_list'),
     path('users/<int:pk>/approve/', views.approve_user, name='approve_user'),
     path('users/<int:pk>/reject/', views.reject_user, name='reject_user'),
@@ -19,6 +20,9 @@ urlpatterns = [
     path('events/', views.AdminEventListView.as_view(), name='event_list'),
     path('events/<int:pk>/delete/', views.delete_event, name='event_delete'),
     path('ticket-history/', TicketHistoryView.as_view(), name='ticket_history'),
+    path('ticket-history/export/', views.TicketHistoryExportView.as_view(), name='ticket_history_export'),
+    path('ticket-history/hosts/', views.HostLookupView.as_view(), name='host_lookup'),
+    path('charts/daily/', views.DailyChartView.as_view(), name='daily_chart'),
 
 
 
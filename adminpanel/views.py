@@ -2,19 +2,25 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib import messages
 from django.views import View
-from django.core.mail import send_mail
 from .forms import *
-from django.conf import settings
 from django.views.generic import ListView, UpdateView, DeleteView, TemplateView
 from django.urls import reverse_lazy
-from django.db.models import Count, Q
+from django.db.models import Count, Prefetch, Q
 from guest.models import Booking
 from host.models import *
-from datetime import timedelta
 from django.utils import timezone
-from django.db.models import Sum
 from accounts.models import CustomUser
-from utils.pagination import paginate_queryset  # your global paginator
+from accounts.search import search_users
+from utils.pagination import paginate_keyset, paginate_queryset  # your global paginator
+from utils.export import EXPORT_FORMATS, booking_facets, filter_bookings, stream_bookings
+from .stats import get_platform_stats
+from .rollups import daily_series
+from .approvals import approve_signups, pending_signups, reject_signups
+from .models import Activity, DailyStats
+from django.http import JsonResponse
+from django.contrib.auth.decorators import login_required
+from django.views.decorators.http import require_POST
+from functools import wraps
 
 class AdminRequiredMixin(UserPassesTestMixin):
     def test_func(self):
@@ -22,7 +28,19 @@ class AdminRequiredMixin(UserPassesTestMixin):
     def handle_no_permission(self):
         messages.warning(self.request, 'You do not have permission to access this page.')
         return redirect('accounts:home')
-    
+
+
+def admin_required(view):
+    """AdminRequiredMixin for function views."""
+    @wraps(view)
+    @login_required
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_superuser:
+            messages.warning(request, 'You do not have permission to access this page.')
+            return redirect('accounts:home')
+        return view(request, *args, **kwargs)
+    return wrapper
+
 
 class AdminEventListView(LoginRequiredMixin, AdminRequiredMixin, ListView):
     model = Event
@@ -31,12 +49,18 @@ class AdminEventListView(LoginRequiredMixin, AdminRequiredMixin, ListView):
     # remove/ignore paginate_by because we use the global paginate_queryset DEFAULT_PER_PAGE
 
     def get_queryset(self):
-        # keep your original queryset logic intact
-        return (
-            Event.objects.all()
-            .prefetch_related('proposals')
-            .order_by('-created_at')
+        # Host joined in, accepted proposal prefetched: a page costs the same few queries at any size
+        events = (
+            Event.objects.select_related('host')
+            .prefetch_related(
+                Prefetch('proposals', queryset=Proposal.objects.filter(status='accepted'), to_attr='accepted_proposals')
+            )
+            .order_by('-created_at', '-id')
         )
+        self.filter_form = AdminEventFilterForm(self.request.GET or None)
+        if self.filter_form.is_valid():
+            events = self.filter_form.filter_queryset(events)
+        return events
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -56,9 +80,10 @@ class AdminEventListView(LoginRequiredMixin, AdminRequiredMixin, ListView):
         # current datetime (needed for end_date comparison)
         context['now'] = timezone.now()
 
-        # attach accepted proposal for each event on the current page only
+        # attach the prefetched accepted proposal (at most one per event)
         for event in context['events']:
-            event.accepted_proposal = event.proposals.filter(status='accepted').first()
+            event.accepted_proposal = event.accepted_proposals[0] if event.accepted_proposals else None
+        context['filter_form'] = self.filter_form
 
         return context
 
@@ -86,52 +111,105 @@ class AdminDashboardView(LoginRequiredMixin, AdminRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        now = timezone.now()
-        thirty_days_ago = now - timedelta(days=30)
-
-        context['total_users'] = CustomUser.objects.count()
-        context['total_hosts'] = CustomUser.objects.filter(role='host').count()
-        context['total_guests'] = CustomUser.objects.filter(role='guest').count()
-        context['total_planners'] = CustomUser.objects.filter(role='planner').count()
-
-        context['pending_approvals'] = CustomUser.objects.filter(
-            role__in=['guest', 'planner'],
-            is_approved=False,
-            is_active=False
-        ).count()
-
-        context['recent_registrations'] = CustomUser.objects.filter(
-            date_joined__gte=thirty_days_ago
-        ).count()
+        # One row read, kept current by adminpanel.signals and reconciled daily (adminpanel.stats)
+        stats = get_platform_stats()
+        context['stats'] = stats
+        context['total_users'] = stats.total_users
+        context['total_hosts'] = stats.total_hosts
+        context['total_guests'] = stats.total_guests
+        context['total_planners'] = stats.total_planners
+        context['pending_approvals'] = stats.pending_approvals
+        context['recent_registrations'] = stats.recent_registrations
+        context['total_events'] = stats.total_events
+        context['total_tickets'] = stats.total_tickets
 
-        context['total_events'] = Event.objects.count()
+        return context
 
-        # Total confirmed tickets
-        context['total_tickets'] = Booking.objects.filter(
-            status='confirmed'
-        ).aggregate(total=Sum('ticket_quantity'))['total'] or 0
+class DailyChartView(LoginRequiredMixin, AdminRequiredMixin, View):
+    """Platform-wide daily series for trend charts, read from the DailyStats rollup (?days=90)."""
 
-        return context
+    def get(self, request, *args, **kwargs):
+        days = request.GET.get('days', '90')
+        days = int(days) if days.isdigit() else 90
+        return JsonResponse(daily_series(
+            DailyStats.objects.all(),
+            ['bookings', 'tickets', 'revenue', 'registrations', 'proposals'],
+            days,
+        ))
 
 class TicketHistoryView(LoginRequiredMixin, AdminRequiredMixin, TemplateView):
     template_name = 'adminpanel/ticket_history.html'
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        params = self.request.GET
 
-        queryset = Booking.objects.select_related(
+        # Filters share utils.export with the export view, so links carry them over
+        queryset = filter_bookings(Booking.objects.all(), params).select_related(
             'guest', 'event'
         ).order_by('-created_at')
 
-        # Apply global pagination
-        page_obj, paginated_queryset = paginate_queryset(self.request, queryset)
+        # Cursor pagination: deep pages cost the same as the first one
+        page_obj, paginated_queryset = paginate_queryset(
+            self.request, queryset, keyset=('-created_at', '-id')
+        )
+
+        # Per-status and used/unused counts under the other filters; cached, so paging is free
+        facets = booking_facets(Booking.objects.all(), params)
+
+        # The host box autocompletes through HostLookupView; events are only
+        # listed for the chosen host, otherwise just the selected one
+        host, event = params.get('host', ''), params.get('event', '')
+        selected_host = None
+        if host.isdigit():
+            selected_host = CustomUser.objects.filter(pk=int(host), role='host').only('id', 'full_name', 'email').first()
+        events = Event.objects.none()
+        if selected_host:
+            events = Event.objects.filter(host=selected_host).only('id', 'name').order_by('name')
+        elif event.isdigit():
+            events = Event.objects.filter(pk=int(event)).only('id', 'name')
 
         context['ticket_history'] = paginated_queryset
         context['page_obj'] = page_obj     # Required by your pagination template
+        context['facets'] = facets
+        context['status_facets'] = [
+            (value, label, facets['status'].get(value, 0)) for value, label in Booking.STATUS_CHOICES
+        ]
+        context['selected_host'] = selected_host
+        context['events'] = events
+        context['filters'] = {name: params.get(name, '') for name in ('event', 'host', 'status', 'used', 'from', 'to')}
 
         return context
 
 
+HOST_LOOKUP_LIMIT = 10
+
+
+class HostLookupView(LoginRequiredMixin, AdminRequiredMixin, View):
+    """Host suggestions for the ticket history filter (?q=), through the user search indexes."""
+
+    def get(self, request, *args, **kwargs):
+        query = request.GET.get('q', '')
+        if len(query.strip()) < 2:
+            return JsonResponse({'results': []})
+        hosts = search_users(CustomUser.objects.all(), query, role='host').values('id', 'full_name', 'email')
+        return JsonResponse({'results': [
+            {'id': host['id'], 'label': f"{host['full_name']} <{host['email']}>"}
+            for host in hosts[:HOST_LOOKUP_LIMIT]
+        ]})
+
+
+class TicketHistoryExportView(LoginRequiredMixin, AdminRequiredMixin, View):
+    """Stream ticket history as CSV or NDJSON, with the same filters as TicketHistoryView."""
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get('format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            export_format = 'csv'
+        queryset = filter_bookings(Booking.objects.all(), request.GET).order_by('created_at', 'id')
+        return stream_bookings(queryset, export_format, 'ticket_history')
+
+
 class PendingApprovalsView(LoginRequiredMixin, AdminRequiredMixin, View):
     template_name = 'adminpanel/pending_approvals.html'
 
@@ -143,13 +221,39 @@ class PendingApprovalsView(LoginRequiredMixin, AdminRequiredMixin, View):
         ).order_by('-date_joined')
 
         # Use your global pagination function
-        page_obj, users = paginate_queryset(request, queryset)
+        page_obj, users = paginate_queryset(request, queryset, keyset=('-date_joined', '-id'))
 
         return render(request, self.template_name, {
             'users': users,
             'page_obj': page_obj,  # required by partial
         })
 
+    def post(self, request, *args, **kwargs):
+        # Bulk approve/reject: the ticked users, or every pending signup
+        action = request.POST.get('action')
+        if request.POST.get('scope') == 'all':
+            selected = pending_signups()
+        else:
+            selected = CustomUser.objects.filter(pk__in=[pk for pk in request.POST.getlist('user_ids') if pk.isdigit()])
+
+        if action == 'approve':
+            count, mailed = approve_signups(selected, admin=request.user)
+            messages.success(request, f'{count} user(s) approved.')
+        elif action == 'reject':
+            count, mailed = reject_signups(selected, admin=request.user)
+            messages.error(request, f'{count} user(s) rejected and deleted.')
+        else:
+            messages.warning(request, 'Invalid action.')
+            return redirect('adminpanel:pending_approvals')
+
+        _mail_warning(request, count, mailed)
+        return redirect('adminpanel:pending_approvals')
+
+
+def _mail_warning(request, count, mailed):
+    if mailed < count:
+        messages.warning(request, f'{count - mailed} notification e-mail(s) could not be sent.')
+
 
 class UserListView(LoginRequiredMixin, AdminRequiredMixin, ListView):
     model = CustomUser
@@ -159,48 +263,41 @@ class UserListView(LoginRequiredMixin, AdminRequiredMixin, ListView):
 
     def get_queryset(self):
         role = self.kwargs.get('role')
-        if role in ['host', 'guest', 'planner']:
-            return CustomUser.objects.filter(role=role).order_by('-date_joined')
-        raise ValueError('Invalid role')
+        if role is not None and role not in ['host', 'guest', 'planner']:
+            raise ValueError('Invalid role')
+        # ?q= goes through the prefix indexes or the FTS table (accounts.search);
+        # the search page has no role and covers everyone
+        return search_users(CustomUser.objects.all(), self.request.GET.get('q'), role=role).order_by('-date_joined')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
         queryset = self.get_queryset()
-        page_obj, users_page = paginate_queryset(self.request, queryset)
+        page_obj, users_page = paginate_queryset(self.request, queryset, keyset=('-date_joined', '-id'))
 
         context['users'] = users_page
         context['page_obj'] = page_obj
-        context['role'] = self.kwargs.get('role', '').title()
+        context['role'] = self.kwargs.get('role', 'user').title()
+        context['query'] = self.request.GET.get('q', '')
 
         return context
 
+@require_POST
+@admin_required
 def approve_user(request, pk):
-    user = get_object_or_404(CustomUser, pk=pk, role__in=['guest', 'planner'], is_approved=False)
-    user.is_approved = True
-    user.is_active = True
-    user.save(update_fields=['is_approved', 'is_active'])
-    send_mail(
-        'EventApp Account Approved',
-        'Your registration has been approved. You can now log in to the platform.',
-        settings.DEFAULT_FROM_EMAIL,
-        [user.email],
-        fail_silently=False,
-    )
+    user = get_object_or_404(pending_signups(), pk=pk)
+    count, mailed = approve_signups(CustomUser.objects.filter(pk=user.pk), admin=request.user)
     messages.success(request, f'User "{user.username}" approved successfully.')
+    _mail_warning(request, count, mailed)
     return redirect(request.META.get('HTTP_REFERER', 'adminpanel:dashboard'))
 
+@require_POST
+@admin_required
 def reject_user(request, pk):
-    user = get_object_or_404(CustomUser, pk=pk, role__in=['guest', 'planner'], is_approved=False)
-    send_mail(
-        'EventApp Account Rejected',
-        'Your registration has been rejected. Please contact support for more details.',
-        settings.DEFAULT_FROM_EMAIL,
-        [user.email],
-        fail_silently=False,
-    )
-    user.delete()  # Or set is_active=False; here delete for simplicity
+    user = get_object_or_404(pending_signups(), pk=pk)
+    count, mailed = reject_signups(CustomUser.objects.filter(pk=user.pk), admin=request.user)
     messages.error(request, f'User "{user.username}" rejected and deleted.')
+    _mail_warning(request, count, mailed)
     return redirect(request.META.get('HTTP_REFERER', 'adminpanel:dashboard'))
 
 class UserEditView(LoginRequiredMixin, AdminRequiredMixin, UpdateView):
@@ -229,16 +326,28 @@ class UserDeleteView(LoginRequiredMixin, AdminRequiredMixin, DeleteView):
         messages.error(request, f'User "{user.username}" deleted successfully.')
         return super().delete(request, *args, **kwargs)
 
+ACTIVITY_KINDS = {kind for kind, _ in Activity.KIND_CHOICES}
+ACTIVITY_PAGE_SIZE = 25
+
+
 class ActivitiesView(LoginRequiredMixin, AdminRequiredMixin, TemplateView):
     template_name = 'adminpanel/activities.html'
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        now = timezone.now()
-        thirty_days_ago = now - timedelta(days=30)
-        
-        context['recent_users'] = CustomUser.objects.filter(date_joined__gte=thirty_days_ago).order_by('-date_joined')[:10]
-        context['pending_count'] = CustomUser.objects.filter(role__in=['guest', 'planner'], is_approved=False).count()
-        # Placeholder: Recent events, tickets, etc.
-        context['recent_events'] = []  # From events app
-        return context
\ No newline at end of file
+
+        # Newest first off the (created_at, id) indexes; ?type= may repeat
+        kinds = [kind for kind in self.request.GET.getlist('type') if kind in ACTIVITY_KINDS]
+        activities = Activity.objects.all()
+        if kinds:
+            activities = activities.filter(kind__in=kinds)
+        page_obj, activities_page = paginate_keyset(
+            self.request, activities, ordering=('-created_at', '-id'), per_page=ACTIVITY_PAGE_SIZE
+        )
+
+        context['activities'] = activities_page
+        context['page_obj'] = page_obj
+        context['kind_choices'] = Activity.KIND_CHOICES
+        context['selected_kinds'] = kinds
+        context['stats'] = get_platform_stats()
+        return context
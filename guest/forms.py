@@ -1,4 +1,8 @@
+from datetime import datetime, time, timedelta
+
 from django import forms
+from django.utils import timezone
+from host.forms import NeedsFilterForm
 from .models import Booking
 
 class BookingForm(forms.ModelForm):
@@ -12,7 +16,12 @@ class BookingForm(forms.ModelForm):
     def __init__(self, *args, event=None, **kwargs):
         super().__init__(*args, **kwargs)
         if event:
-            self.fields['ticket_quantity'].help_text = f"Tickets for {event.name} (₹{event.budget / event.guest_count:.2f} each approx.)"
+            help_text = f"Tickets for {event.name} (₹{event.budget / event.guest_count:.2f} each approx.)"
+            remaining = getattr(event, 'remaining', None)
+            if remaining is not None:
+                help_text += f" — {max(remaining, 0)} left"
+                self.fields['ticket_quantity'].widget.attrs['max'] = max(min(10, remaining), 1)
+            self.fields['ticket_quantity'].help_text = help_text
 
     def clean_ticket_quantity(self):
         quantity = self.cleaned_data['ticket_quantity']
@@ -34,4 +43,38 @@ class PaymentForm(forms.Form):
         card = self.cleaned_data['card_number'].replace(' ', '')
         if len(card) != 16 or not card.isdigit():
             raise forms.ValidationError('Invalid card number.')
-        return card
\ No newline at end of file
+        return card
+
+
+class EventSearchForm(NeedsFilterForm):
+    """Catalog filters; every predicate maps onto an indexed column or the FTS index."""
+    q = forms.CharField(required=False, label='Search', widget=forms.TextInput(attrs={'placeholder': 'Name or venue'}))
+    date_from = forms.DateField(required=False, label='From', widget=forms.DateInput(attrs={'type': 'date'}))
+    date_to = forms.DateField(required=False, label='To', widget=forms.DateInput(attrs={'type': 'date'}))
+    price_min = forms.DecimalField(required=False, min_value=0, label='Min ₹/ticket')
+    price_max = forms.DecimalField(required=False, min_value=0, label='Max ₹/ticket')
+    available = forms.BooleanField(required=False, label='Only events with seats left')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in ('q', 'date_from', 'date_to', 'price_min', 'price_max'):
+            self.fields[name].widget.attrs['class'] = 'form-control'
+        self.fields['available'].widget.attrs['class'] = 'form-check-input'
+
+    def filter_queryset(self, queryset):
+        """Apply the cleaned filters to an Event queryset (call after is_valid())."""
+        queryset = super().filter_queryset(queryset)
+        data = self.cleaned_data
+        if data.get('date_from'):
+            queryset = queryset.filter(start_date__gte=timezone.make_aware(datetime.combine(data['date_from'], time.min)))
+        if data.get('date_to'):
+            queryset = queryset.filter(start_date__lt=timezone.make_aware(datetime.combine(data['date_to'] + timedelta(days=1), time.min)))
+        if data.get('price_min') is not None:
+            queryset = queryset.filter(ticket_price__gte=data['price_min'])
+        if data.get('price_max') is not None:
+            queryset = queryset.filter(ticket_price__lte=data['price_max'])
+        if data.get('available'):
+            queryset = queryset.filter(remaining__gt=0)
+        if data.get('q'):
+            queryset = queryset.search(data['q'])
+        return queryset
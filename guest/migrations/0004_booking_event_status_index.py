@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('guest', '0003_remove_booking_qr_code_booking_is_used_and_more'),
+        ('host', '0003_checkin_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='booking',
+            name='status',
+            field=models.CharField(choices=[('confirmed', 'Confirmed'), ('cancelled', 'Cancelled')], default='pending', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['event', 'status', '-created_at', '-id'], name='booking_event_status_created'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('guest', '0004_booking_event_status_index'),
+        ('host', '0003_checkin_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['-created_at', '-id'], name='booking_created_id'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('guest', '0005_keyset_pagination_indexes'),
+        ('host', '0009_admin_event_list_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='booking',
+            name='booking_created_id',
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['-created_at', '-id', 'status', 'is_used'], name='booking_created_id'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='booking_status_created'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['is_used', '-created_at', '-id'], name='booking_used_created'),
+        ),
+    ]
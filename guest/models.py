@@ -38,6 +38,14 @@ class Booking(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['event', 'status', '-created_at', '-id'], name='booking_event_status_created'),
+            # status and is_used ride along so the ticket history facet counts are index-only
+            models.Index(fields=['-created_at', '-id', 'status', 'is_used'], name='booking_created_id'),
+            # Admin ticket history filters; with both set, the other one is checked in index order
+            models.Index(fields=['status', '-created_at', '-id'], name='booking_status_created'),
+            models.Index(fields=['is_used', '-created_at', '-id'], name='booking_used_created'),
+        ]
 
     def __str__(self):
         return f"Booking {self.booking_id} for {self.event.name} by {self.guest.username}"
@@ -12,5 +12,6 @@ urlpatterns = [
     path('bookings/<int:pk>/cancel/', views.cancel_booking, name='cancel_booking'), 
     path('eticket/<uuid:booking_id>/', views.ETicketView.as_view(), name='eticket'),
     path('events/', views.EventListView.as_view(), name='event_list'),
+    path('events/search/', views.EventSearchAPIView.as_view(), name='event_search_api'),
 
 ]
\ No newline at end of file
@@ -2,12 +2,13 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib import messages
 from django.views.generic import ListView, DetailView, CreateView, TemplateView
-from django.urls import reverse_lazy
-from django.http import HttpResponse
-from django.db import models
+from django.urls import reverse, reverse_lazy
+from django.http import HttpResponse, JsonResponse
+from django.views import View
+from django.db import transaction
 from django.utils import timezone
 from .models import Booking
-from .forms import BookingForm, PaymentForm
+from .forms import BookingForm, EventSearchForm, PaymentForm
 from host.models import Event, Proposal
 from utils.pagination import paginate_queryset  # your global paginator
 
@@ -29,11 +30,11 @@ class GuestDashboardView(LoginRequiredMixin, GuestRequiredMixin, ListView):
     paginate_by = 6
 
     def get_queryset(self):
-        confirmed_events = Event.objects.filter(
-            proposals__status='accepted',
+        # Published upcoming events: a plain range scan on (is_published, start_date)
+        return Event.objects.filter(
+            is_published=True,
             start_date__gt=timezone.now()
-        ).distinct()
-        return confirmed_events
+        ).with_remaining().order_by('start_date', 'id')
 
 class EventDetailView(LoginRequiredMixin, GuestRequiredMixin, DetailView):
     model = Event
@@ -42,9 +43,9 @@ class EventDetailView(LoginRequiredMixin, GuestRequiredMixin, DetailView):
 
     def get_queryset(self):
         return Event.objects.filter(
-            proposals__status='accepted',
+            is_published=True,
             start_date__gt=timezone.now()
-        ).distinct()
+        ).with_remaining().order_by('start_date', 'id')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -64,22 +65,25 @@ class BookingCreateView(LoginRequiredMixin, GuestRequiredMixin, CreateView):
     form_class = BookingForm
     template_name = 'guest/booking_form.html'
 
+    def get_event(self):
+        # Loaded once per request, with remaining seats annotated in the same query
+        if not hasattr(self, '_event'):
+            self._event = get_object_or_404(Event.objects.with_remaining(), pk=self.kwargs['pk'])
+        return self._event
+
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
-        kwargs['event'] = get_object_or_404(Event, pk=self.kwargs['pk'])
+        kwargs['event'] = self.get_event()
         return kwargs
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['event'] = get_object_or_404(Event, pk=self.kwargs['pk'])
+        context['event'] = self.get_event()
         return context
 
     def form_valid(self, form):
-            event = get_object_or_404(Event, pk=self.kwargs['pk'])
-            
-            confirmed_bookings = Booking.objects.filter(event=event, status='confirmed')
-            total_booked = confirmed_bookings.aggregate(models.Sum('ticket_quantity'))['ticket_quantity__sum'] or 0
-            remaining = event.guest_count - total_booked
+            event = self.get_event()
+            remaining = event.remaining
 
             if remaining <= 0:
                 messages.warning(self.request, f"Bookings for '{event.name}' are full.")
@@ -119,11 +123,15 @@ class PaymentSimulationView(LoginRequiredMixin, GuestRequiredMixin, TemplateView
         payment_form = PaymentForm(request.POST)
         
         if payment_form.is_valid():
-            # Generate e-ticket QR code
-            booking.generate_qr_code()
-            booking.status = 'confirmed'  # mark booking as confirmed only after payment
-            booking.save()
-            
+            # Lock the row so a double submit confirms the booking (and counts its
+            # tickets through host.signals) only once
+            with transaction.atomic():
+                booking = Booking.objects.select_for_update().get(pk=booking.pk)
+                # Generate e-ticket QR code
+                booking.generate_qr_code()
+                booking.status = 'confirmed'  # mark booking as confirmed only after payment
+                booking.save()
+
             messages.success(request, 'Payment successful! Booking confirmed and e-ticket generated.')
             return redirect('guest:eticket', booking_id=booking.booking_id)
 
@@ -153,7 +161,7 @@ def cancel_booking(request, pk):
     booking = get_object_or_404(Booking, pk=pk, guest=request.user, status='confirmed')
     if request.method == 'POST':
         booking.status = 'cancelled'
-        booking.save()
+        booking.save()  # host.signals takes the tickets off the check-in counter
         messages.success(request, 'Booking cancelled. Refund processed.')
         return redirect('guest:booking_list')
     return render(request, 'guest/booking_confirm_cancel.html', {'booking': booking})
@@ -180,10 +188,14 @@ class EventListView(LoginRequiredMixin, GuestRequiredMixin, ListView):
     paginate_by = None   # IMPORTANT: disable ListView's pagination
 
     def get_queryset(self):
-        return Event.objects.filter(
-            proposals__status='accepted',
+        events = Event.objects.filter(
+            is_published=True,
             start_date__gt=timezone.now()
-        ).distinct()
+        ).with_remaining()
+        self.search_form = EventSearchForm(self.request.GET or None)
+        if self.search_form.is_valid():
+            events = self.search_form.filter_queryset(events)
+        return events.order_by('start_date', 'id')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -195,10 +207,43 @@ class EventListView(LoginRequiredMixin, GuestRequiredMixin, ListView):
 
         context['page_obj'] = page_obj     # required by your partial
         context['events'] = items          # paginated events
+        context['search_form'] = self.search_form
 
         return context
 
 
+
+class EventSearchAPIView(LoginRequiredMixin, GuestRequiredMixin, View):
+    """JSON version of the catalog search, paged by a (start_date, id) cursor."""
+
+    def get(self, request, *args, **kwargs):
+        form = EventSearchForm(request.GET)
+        if not form.is_valid():
+            return JsonResponse({'success': False, 'errors': form.errors}, status=400)
+
+        events = form.filter_queryset(
+            Event.objects.filter(is_published=True, start_date__gt=timezone.now()).with_remaining()
+        )
+        page_obj, items = paginate_queryset(request, events, keyset=('start_date', 'id'))
+        return JsonResponse({
+            'success': True,
+            'results': [
+                {
+                    'id': event.pk,
+                    'name': event.name,
+                    'start_date': event.start_date.isoformat(),
+                    'end_date': event.end_date.isoformat(),
+                    'ticket_price': str(event.ticket_price),
+                    'remaining': event.remaining,
+                    'needs': event.needs_list,
+                    'url': request.build_absolute_uri(reverse('guest:event_detail', args=[event.pk])),
+                }
+                for event in items
+            ],
+            'next': page_obj.next_cursor,
+            'previous': page_obj.previous_cursor,
+        })
+
     # For download: Add PDF response if reportlab
     # def render_to_response(self, context, **response_kwargs):
     #     response = HttpResponse(content_type='application/pdf')
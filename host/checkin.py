@@ -0,0 +1,297 @@
+"""
+Gate check-in helpers shared by the QR scanner endpoints.
+
+The scanner can cache a compact manifest of an event's valid tickets and keep
+admitting guests while offline; the queued scans are uploaded later in one
+batch and applied here. Every admission also bumps the event's
+CheckinCounter and per-minute CheckinMinute bucket, which the live check-in
+dashboard reads instead of scanning bookings.
+"""
+import base64
+import uuid
+from collections import Counter
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from adminpanel.activity import activity, log_activities
+from guest.models import Booking
+from .models import CheckinCounter, CheckinMinute
+
+# Number of per-minute buckets returned with each dashboard snapshot.
+RATE_WINDOW_MINUTES = 10
+
+# Upper bound on scan records accepted in a single batch upload.
+MAX_BATCH_SCANS = 1000
+
+# Oldest client scan time accepted from an offline upload; older (or future)
+# times are replaced with the server time so CheckinMinute stays plausible.
+MAX_OFFLINE_SCAN_AGE = timedelta(days=2)
+
+
+def build_manifest(event):
+    """
+    Return a JSON-serialisable manifest of the confirmed bookings for `event`.
+
+    `ids` is the base64 encoding of the 16-byte booking UUIDs, sorted so the
+    scanner can binary-search it. `quantities` is aligned with `ids` and
+    `used` is a base64 bitmap (bit i set = ticket i already scanned).
+    """
+    rows = sorted(
+        Booking.objects.filter(event=event, status='confirmed')
+        .values_list('booking_id', 'ticket_quantity', 'is_used')
+        .iterator(),
+        key=lambda row: row[0].bytes,
+    )
+
+    ids = bytearray()
+    quantities = []
+    used = bytearray((len(rows) + 7) // 8)
+    for index, (booking_id, quantity, is_used) in enumerate(rows):
+        ids += booking_id.bytes
+        quantities.append(quantity)
+        if is_used:
+            used[index // 8] |= 1 << (index % 8)
+
+    return {
+        'event': event.pk,
+        'name': event.name,
+        'generated_at': timezone.now().isoformat(),
+        'count': len(rows),
+        'ids': base64.b64encode(bytes(ids)).decode('ascii'),
+        'quantities': quantities,
+        'used': base64.b64encode(bytes(used)).decode('ascii'),
+    }
+
+
+def _parse_time(value):
+    """An aware datetime from an ISO string; None if missing, ValueError if impossible."""
+    parsed = parse_datetime(str(value or ''))
+    if parsed is not None and timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _parse_scan(record, now):
+    """
+    Return (scanned_at, booking_uuid) for one uploaded record, or None if
+    malformed. The client's scan time is kept only if it lies between the
+    manifest's generation (or MAX_OFFLINE_SCAN_AGE ago) and now.
+    """
+    if not isinstance(record, dict):
+        return None
+    try:
+        booking_id = uuid.UUID(str(record.get('booking_id')))
+        scanned_at = _parse_time(record.get('scanned_at'))
+    except ValueError:
+        return None
+
+    earliest = now - MAX_OFFLINE_SCAN_AGE
+    try:
+        generated_at = _parse_time(record.get('manifest_generated_at'))
+    except ValueError:
+        generated_at = None
+    if generated_at is not None and earliest < generated_at <= now:
+        earliest = generated_at
+
+    if scanned_at is None or not earliest <= scanned_at <= now:
+        scanned_at = now
+    return scanned_at, booking_id
+
+
+def apply_scan_batch(host, records):
+    """
+    Apply offline scan records for `host` in a single transaction.
+
+    Records are replayed in scan-time order and the first scan of a booking
+    wins; any later scan of the same ticket (in this batch or already applied
+    on the server) is reported as a duplicate. Returns a dict with the
+    admitted bookings, duplicates and invalid booking ids.
+    """
+    now = timezone.now()
+    scans = []
+    invalid = []
+    for record in records:
+        parsed = _parse_scan(record, now)
+        if parsed is None:
+            invalid.append(str(record.get('booking_id', '')) if isinstance(record, dict) else '')
+        else:
+            scans.append(parsed)
+    scans.sort(key=lambda scan: scan[0])
+
+    admitted = []
+    duplicates = []
+    with transaction.atomic():
+        bookings = {
+            booking.booking_id: booking
+            for booking in Booking.objects.select_for_update(of=('self',))
+            .select_related('guest')
+            .filter(
+                booking_id__in={booking_id for _, booking_id in scans},
+                event__host=host,
+                status='confirmed',
+            )
+        }
+
+        for scanned_at, booking_id in scans:
+            booking = bookings.get(booking_id)
+            if booking is None:
+                invalid.append(str(booking_id))
+                continue
+            if booking.is_used:
+                duplicates.append({
+                    'booking_id': str(booking_id),
+                    'guest': booking.guest.full_name,
+                    'scanned_at': scanned_at.isoformat(),
+                    'first_scanned_at': booking.scanned_at.isoformat() if booking.scanned_at else None,
+                })
+                continue
+            booking.is_used = True
+            booking.scanned_at = max(scanned_at, booking.created_at)
+            admitted.append(booking)
+
+        Booking.objects.bulk_update(admitted, ['is_used', 'scanned_at'])
+        record_admissions(admitted)
+
+    return {
+        'admitted': admitted,
+        'duplicates': duplicates,
+        'invalid': invalid,
+    }
+
+
+def _counter_totals(event_id):
+    """Recompute counter values for an event straight from its bookings."""
+    totals = Booking.objects.filter(event_id=event_id, status='confirmed').aggregate(
+        expected=Sum('ticket_quantity'),
+        admitted=Sum('ticket_quantity', filter=Q(is_used=True)),
+        admitted_bookings=Count('id', filter=Q(is_used=True)),
+    )
+    return {key: value or 0 for key, value in totals.items()}
+
+
+def get_checkin_counter(event_id):
+    """
+    Return (counter, created) for an event, seeding a new counter from the
+    bookings table so events that predate the counter start out correct.
+    """
+    try:
+        return CheckinCounter.objects.get(event_id=event_id), False
+    except CheckinCounter.DoesNotExist:
+        pass
+    try:
+        with transaction.atomic():
+            return CheckinCounter.objects.create(event_id=event_id, **_counter_totals(event_id)), True
+    except IntegrityError:
+        return CheckinCounter.objects.get(event_id=event_id), False
+
+
+def reconcile_checkin_counters(event_ids=None):
+    """Recompute existing counters (all, or those of `event_ids`) from bookings; returns how many."""
+    counters = CheckinCounter.objects.all()
+    if event_ids is not None:
+        counters = counters.filter(event_id__in=event_ids)
+    reconciled = 0
+    for event_id in counters.values_list('event_id', flat=True).iterator():
+        reconciled += CheckinCounter.objects.filter(event_id=event_id).update(
+            **_counter_totals(event_id), updated_at=timezone.now()
+        )
+    return reconciled
+
+
+def booking_checkin_state(booking):
+    """What a booking contributes to its event's counter: (event_id, expected, admitted, admitted_bookings)."""
+    if booking.status != 'confirmed':
+        return (booking.event_id, 0, 0, 0)
+    if booking.is_used:
+        return (booking.event_id, booking.ticket_quantity, booking.ticket_quantity, 1)
+    return (booking.event_id, booking.ticket_quantity, 0, 0)
+
+
+def adjust_checkin_counter(event_id, expected=0, admitted=0, admitted_bookings=0):
+    """
+    Atomically apply deltas to an event's counter (after the booking change is
+    saved). A no-op while the event has no counter: get_checkin_counter seeds
+    it from bookings, which already include the change.
+    """
+    if not (expected or admitted or admitted_bookings):
+        return
+    CheckinCounter.objects.filter(event_id=event_id).update(
+        expected=F('expected') + expected,
+        admitted=F('admitted') + admitted,
+        admitted_bookings=F('admitted_bookings') + admitted_bookings,
+        updated_at=timezone.now(),
+    )
+
+
+def record_admissions(bookings):
+    """
+    Update counters and per-minute buckets for bookings that were just
+    admitted, and add them to the admin activity feed. Callers load
+    `guest` with the bookings.
+    """
+    per_event = {}
+    minutes = Counter()
+    for booking in bookings:
+        tickets, count = per_event.get(booking.event_id, (0, 0))
+        per_event[booking.event_id] = (tickets + booking.ticket_quantity, count + 1)
+        minutes[(booking.event_id, booking.scanned_at.replace(second=0, microsecond=0))] += 1
+
+    for event_id, (tickets, count) in per_event.items():
+        adjust_checkin_counter(event_id, admitted=tickets, admitted_bookings=count)
+    # The scan paths write is_used with queryset updates; a later save() of these
+    # instances must not count the admission again (see host.signals)
+    for booking in bookings:
+        booking._checkin_state = booking_checkin_state(booking)
+
+    for (event_id, minute), scans in minutes.items():
+        updated = CheckinMinute.objects.filter(event_id=event_id, minute=minute).update(
+            scans=F('scans') + scans
+        )
+        if not updated:
+            try:
+                with transaction.atomic():
+                    CheckinMinute.objects.create(event_id=event_id, minute=minute, scans=scans)
+            except IntegrityError:
+                CheckinMinute.objects.filter(event_id=event_id, minute=minute).update(
+                    scans=F('scans') + scans
+                )
+
+    log_activities([
+        activity(
+            'checkin',
+            f'{booking.guest.username} checked in to event #{booking.event_id} ({booking.ticket_quantity} ticket(s))',
+            actor_id=booking.guest_id, object_id=booking.pk,
+        )
+        for booking in bookings
+    ])
+
+
+def checkin_snapshot(event):
+    """Current check-in figures for the live dashboard; costs two small queries."""
+    counter, _ = get_checkin_counter(event.pk)
+    now = timezone.now().replace(second=0, microsecond=0)
+    buckets = dict(
+        CheckinMinute.objects.filter(
+            event=event,
+            minute__gt=now - timedelta(minutes=RATE_WINDOW_MINUTES),
+        ).values_list('minute', 'scans')
+    )
+    per_minute = [
+        buckets.get(now - timedelta(minutes=offset), 0)
+        for offset in range(RATE_WINDOW_MINUTES - 1, -1, -1)
+    ]
+    return {
+        'event': event.pk,
+        'expected': counter.expected,
+        'admitted': counter.admitted,
+        'remaining': max(counter.expected - counter.admitted, 0),
+        'admitted_bookings': counter.admitted_bookings,
+        # Last complete minute; the current minute is still filling up
+        'scan_rate': per_minute[-2] if RATE_WINDOW_MINUTES > 1 else per_minute[-1],
+        'scans_per_minute': per_minute,
+        'updated_at': counter.updated_at.isoformat(),
+    }
@@ -13,16 +13,20 @@ class EventForm(forms.ModelForm):
 
     class Meta:
         model = Event
-        fields = ['name', 'start_date', 'end_date', 'budget', 'guest_count', 'needs', 'banner', 'venue_details']
+        fields = ['name', 'start_date', 'end_date', 'budget', 'guest_count', 'banner', 'venue_details']
         widgets = {
             'start_date': forms.DateTimeInput(attrs={'type': 'datetime-local'}),
             'end_date': forms.DateTimeInput(attrs={'type': 'datetime-local'}),
             'venue_details': forms.Textarea(attrs={'rows': 3}),
         }
 
+    field_order = ['name', 'start_date', 'end_date', 'budget', 'guest_count', 'needs', 'banner', 'venue_details']
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # JS for future dates (template handles min date)
+        if self.instance.pk:
+            self.fields['needs'].initial = self.instance.needs_list
 
     def clean(self):
         cleaned_data = super().clean()
@@ -40,11 +44,37 @@ class EventForm(forms.ModelForm):
         if guest_count and guest_count <= 0:
             raise ValidationError('Guest count must be greater than 0.')
 
-        # Handle multi needs
-        needs = cleaned_data.get('needs', [])
-        cleaned_data['needs'] = ','.join(needs)
         return cleaned_data
 
+    def save(self, commit=True):
+        # needs is not a model field; it is stored as Event.needs_mask
+        self.instance.needs_list = self.cleaned_data.get('needs', [])
+        return super().save(commit=commit)
+
+
+class NeedsFilterForm(forms.Form):
+    """Service filter shared by the guest catalog and the planner event list."""
+    needs = forms.MultipleChoiceField(
+        choices=Event.NEEDS_CHOICES,
+        widget=forms.CheckboxSelectMultiple,
+        required=False,
+        label='Services'
+    )
+    needs_match = forms.ChoiceField(
+        choices=[('all', 'All selected'), ('any', 'Any selected')],
+        required=False,
+        initial='all',
+        label='Match',
+        widget=forms.Select(attrs={'class': 'form-select form-select-sm w-auto'})
+    )
+
+    def filter_queryset(self, queryset):
+        """Apply the service filter to an Event queryset (call after is_valid())."""
+        return queryset.with_needs(
+            self.cleaned_data.get('needs'),
+            match=self.cleaned_data.get('needs_match') or 'all',
+        )
+
 
 class ProposalAcceptForm(forms.ModelForm):
     class Meta:
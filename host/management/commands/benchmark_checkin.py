@@ -0,0 +1,226 @@
+"""
+Gate throughput benchmark for the QR verification endpoint.
+
+Seeds a throwaway test database with one event and a growing number of
+bookings, then drives `host:verify_qr` through the Django test client from
+concurrent worker threads. For every table size it reports p50/p95/p99
+latency, throughput and queries per scan, and writes the results as JSON
+(to the system temp directory unless --output says otherwise) so they can
+be compared across releases.
+
+    python manage.py benchmark_checkin --bookings 10000 100000 1000000 \\
+        --scans 2000 --workers 8 --output /path/to/bench_checkin.json
+
+Your real database is never touched.
+"""
+import json
+import os
+import platform
+import random
+import tempfile
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from guest.models import Booking
+from host.models import Event
+
+SEED_BATCH_SIZE = 5000
+GUEST_POOL_SIZE = 500
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark QR check-in throughput and latency against growing Booking tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bookings', type=int, nargs='+', default=[10000],
+                            help='Booking table sizes to benchmark, ascending (default: 10000).')
+        parser.add_argument('--scans', type=int, default=1000,
+                            help='Scans issued per table size (default: 1000).')
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Concurrent scanner threads (default: 4).')
+        parser.add_argument('--invalid-ratio', type=float, default=0.05,
+                            help='Fraction of scans using unknown QR codes (default: 0.05).')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Random seed for the scan mix (default: 0).')
+        default_output = os.path.join(tempfile.gettempdir(), 'bench_checkin.json')
+        parser.add_argument('--output', default=default_output,
+                            help=f'Where to write the JSON results (default: {default_output}).')
+
+    def handle(self, *args, **options):
+        sizes = sorted(options['bookings'])
+        if sizes[0] <= 0 or options['scans'] <= 0 or options['workers'] <= 0:
+            raise CommandError('--bookings, --scans and --workers must be positive.')
+
+        setup_test_environment()
+        old_name = self._create_benchmark_db()
+        try:
+            results = self._run(sizes, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'benchmark': 'checkin_verify_qr',
+            'created_at': timezone.now().isoformat(),
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'machine': platform.machine(),
+                'cpu_count': os.cpu_count(),
+            },
+            'parameters': {
+                'scans': options['scans'],
+                'workers': options['workers'],
+                'invalid_ratio': options['invalid_ratio'],
+                'seed': options['seed'],
+            },
+            'results': results,
+        }
+        with open(options['output'], 'w') as fh:
+            json.dump(report, fh, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+    def _create_benchmark_db(self):
+        """Create a test database; SQLite uses a temp file so worker threads share it."""
+        old_name = connection.settings_dict['NAME']
+        if connection.vendor == 'sqlite':
+            connection.settings_dict['TEST']['NAME'] = os.path.join(
+                tempfile.mkdtemp(prefix='bench_checkin_'), 'bench.sqlite3'
+            )
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        return old_name
+
+    def _run(self, sizes, options):
+        rng = random.Random(options['seed'])
+        now = timezone.now()
+        host = CustomUser.objects.create_user(
+            username='bench_host', email='bench_host@example.com', password='bench',
+            role='host', is_approved=True, full_name='Bench Host',
+        )
+        event = Event.objects.create(
+            host=host, name='Benchmark Event', start_date=now + timedelta(days=1),
+            end_date=now + timedelta(days=2), budget=100000, guest_count=max(sizes),
+        )
+        guests = CustomUser.objects.bulk_create([
+            CustomUser(username=f'bench_guest_{i}', email=f'bench_guest_{i}@example.com',
+                       role='guest', is_approved=True, full_name=f'Bench Guest {i}')
+            for i in range(GUEST_POOL_SIZE)
+        ])
+
+        results = []
+        seeded = 0
+        for size in sizes:
+            self.stdout.write(f'Seeding {size - seeded} bookings (total {size})...')
+            self._seed_bookings(event, guests, size - seeded)
+            seeded = size
+
+            booking_ids = [str(b) for b in Booking.objects.values_list('booking_id', flat=True)]
+            scans = [
+                str(uuid.uuid4()) if rng.random() < options['invalid_ratio'] else rng.choice(booking_ids)
+                for _ in range(options['scans'])
+            ]
+            result = self._drive(host, scans, options['workers'])
+            result['bookings'] = size
+            results.append(result)
+            self.stdout.write(
+                f"  {size:>9} bookings: {result['throughput_per_sec']:.1f} scans/s, "
+                f"p50 {result['latency_ms']['p50']:.2f} ms, p95 {result['latency_ms']['p95']:.2f} ms, "
+                f"p99 {result['latency_ms']['p99']:.2f} ms, {result['queries_per_scan']['mean']:.2f} queries/scan"
+            )
+        return results
+
+    def _seed_bookings(self, event, guests, count):
+        for start in range(0, count, SEED_BATCH_SIZE):
+            Booking.objects.bulk_create([
+                Booking(guest=guests[(start + i) % len(guests)], event=event, ticket_quantity=1,
+                        total_amount=100, status='confirmed')
+                for i in range(min(SEED_BATCH_SIZE, count - start))
+            ])
+
+    def _drive(self, host, scans, workers):
+        """Issue `scans` from `workers` threads and collect per-scan timings."""
+        url = reverse('host:verify_qr')
+        latencies = []
+        query_counts = []
+        outcomes = {'admitted': 0, 'already_used': 0, 'rejected': 0, 'errors': 0}
+        lock = threading.Lock()
+        chunks = [scans[i::workers] for i in range(workers)]
+
+        def worker(chunk):
+            client = Client()
+            client.force_login(host)
+            local_latencies, local_queries = [], []
+            local_outcomes = dict.fromkeys(outcomes, 0)
+            conn = connections['default']
+            try:
+                for qrdata in chunk:
+                    with CaptureQueriesContext(conn) as ctx:
+                        started = time.perf_counter()
+                        response = client.post(url, {'qrdata': qrdata})
+                        local_latencies.append((time.perf_counter() - started) * 1000)
+                    local_queries.append(len(ctx.captured_queries))
+
+                    data = response.json() if response.status_code == 200 else {}
+                    if data.get('success'):
+                        local_outcomes['admitted'] += 1
+                    elif data.get('already_used'):
+                        local_outcomes['already_used'] += 1
+                    elif str(data.get('message', '')).startswith('Server error'):
+                        local_outcomes['errors'] += 1
+                    else:
+                        local_outcomes['rejected'] += 1
+            finally:
+                conn.close()
+            with lock:
+                latencies.extend(local_latencies)
+                query_counts.extend(local_queries)
+                for key, value in local_outcomes.items():
+                    outcomes[key] += value
+
+        threads = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks if chunk]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            'scans': len(latencies),
+            'workers': workers,
+            'elapsed_sec': round(elapsed, 4),
+            'throughput_per_sec': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+            'latency_ms': {
+                'mean': round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+                'p50': round(percentile(latencies, 50), 3),
+                'p95': round(percentile(latencies, 95), 3),
+                'p99': round(percentile(latencies, 99), 3),
+                'max': round(latencies[-1], 3) if latencies else 0.0,
+            },
+            'queries_per_scan': {
+                'mean': round(sum(query_counts) / len(query_counts), 3) if query_counts else 0.0,
+                'max': max(query_counts) if query_counts else 0,
+            },
+            'outcomes': outcomes,
+        }
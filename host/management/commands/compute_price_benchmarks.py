@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from host.pricing import compute_price_benchmarks
+
+
+class Command(BaseCommand):
+    help = 'Recompute proposal price percentiles per needs and guest-count bucket (run periodically).'
+
+    def handle(self, *args, **options):
+        try:
+            count = compute_price_benchmarks()
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(f'Wrote {count} price benchmarks.'))
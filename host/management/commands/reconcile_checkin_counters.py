@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from host.checkin import reconcile_checkin_counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute the live check-in counters from the bookings table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event', type=int, action='append', dest='events',
+                            help='Only this event id (repeatable); default is every counter.')
+
+    def handle(self, *args, **options):
+        count = reconcile_checkin_counters(options['events'])
+        self.stdout.write(self.style.SUCCESS(f'Reconciled {count} check-in counter(s).'))
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('host', '0002_alter_event_needs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CheckinCounter',
+            fields=[
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='checkin_counter', serialize=False, to='host.event')),
+                ('expected', models.IntegerField(default=0)),
+                ('admitted', models.IntegerField(default=0)),
+                ('admitted_bookings', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CheckinMinute',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('minute', models.DateTimeField()),
+                ('scans', models.PositiveIntegerField(default=0)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='checkin_minutes', to='host.event')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('event', 'minute'), name='unique_checkin_minute')],
+            },
+        ),
+    ]
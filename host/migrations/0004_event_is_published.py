@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def publish_events_with_accepted_proposals(apps, schema_editor):
+    Event = apps.get_model('host', 'Event')
+    Event.objects.filter(proposals__status='accepted').update(is_published=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('host', '0003_checkin_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='is_published',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['is_published', 'start_date'], name='event_published_start'),
+        ),
+        migrations.RunPython(publish_events_with_accepted_proposals, migrations.RunPython.noop),
+    ]
+
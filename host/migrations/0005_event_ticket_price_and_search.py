@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:39
+
+from django.conf import settings
+from decimal import Decimal
+
+from django.db import migrations, models
+
+from host.search import install_event_fts, uninstall_event_fts
+
+
+def fill_ticket_price(apps, schema_editor):
+    Event = apps.get_model('host', 'Event')
+    events = list(Event.objects.filter(guest_count__gt=0).only('budget', 'guest_count'))
+    for event in events:
+        event.ticket_price = (event.budget / event.guest_count).quantize(Decimal('0.01'))
+    Event.objects.bulk_update(events, ['ticket_price'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('host', '0004_event_is_published'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='ticket_price',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=10),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['is_published', 'ticket_price'], name='event_published_price'),
+        ),
+        migrations.RunPython(fill_ticket_price, migrations.RunPython.noop),
+        # Must run after the schema changes above: SQLite rebuilds host_event for them
+        migrations.RunPython(install_event_fts, uninstall_event_fts),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:41
+
+from django.db import migrations, models
+
+from host.search import install_event_fts
+
+# Frozen copy of Event.NEEDS_CHOICES order at the time of this migration.
+NEEDS_CODES = ['catering', 'decorations', 'photography', 'music', 'venue', 'other']
+
+
+def needs_csv_to_mask(apps, schema_editor):
+    Event = apps.get_model('host', 'Event')
+    events = list(Event.objects.exclude(needs='').only('needs'))
+    for event in events:
+        codes = {code.strip() for code in event.needs.split(',')}
+        event.needs_mask = sum(1 << index for index, code in enumerate(NEEDS_CODES) if code in codes)
+    Event.objects.bulk_update(events, ['needs_mask'], batch_size=1000)
+
+
+def needs_mask_to_csv(apps, schema_editor):
+    Event = apps.get_model('host', 'Event')
+    events = list(Event.objects.exclude(needs_mask=0).only('needs_mask'))
+    for event in events:
+        event.needs = ','.join(code for index, code in enumerate(NEEDS_CODES) if event.needs_mask & (1 << index))
+    Event.objects.bulk_update(events, ['needs'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('host', '0005_event_ticket_price_and_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='needs_mask',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(needs_csv_to_mask, needs_mask_to_csv),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_published_start',
+        ),
+        migrations.RemoveField(
+            model_name='event',
+            name='needs',
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['is_published', 'start_date', 'needs_mask'], name='event_published_start_needs'),
+        ),
+        # SQLite rebuilt host_event above, which dropped the FTS triggers
+        migrations.RunPython(install_event_fts, migrations.RunPython.noop),
+    ]
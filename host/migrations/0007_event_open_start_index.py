@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('host', '0006_event_needs_mask'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('is_published', False)), fields=['start_date', 'id'], name='event_open_start'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('host', '0007_event_open_start_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProposalPriceBenchmark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('needs_mask', models.PositiveIntegerField(blank=True, null=True)),
+                ('guest_bucket', models.PositiveIntegerField()),
+                ('sample_size', models.PositiveIntegerField()),
+                ('quantiles', models.JSONField()),
+                ('computed_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['guest_bucket', 'needs_mask'], name='price_benchmark_lookup')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('host', '0008_proposal_price_benchmarks'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['-created_at', '-id'], name='event_created'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['host', '-created_at', '-id'], name='event_host_created'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['is_published', '-created_at', '-id'], name='event_published_created'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('host', '0009_admin_event_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='proposalpricebenchmark',
+            name='service',
+            field=models.CharField(blank=True, choices=[('catering', 'Catering'), ('decorations', 'Decorations'), ('photography', 'Photography'), ('music', 'Music/DJ'), ('venue', 'Venue Setup'), ('other', 'Other')], max_length=20),
+        ),
+    ]
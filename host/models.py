@@ -1,8 +1,58 @@
+import bisect
+from decimal import Decimal
+
+from django.apps import apps
+from django.core.cache import cache
 from django.db import models
+from django.db.models.functions import Coalesce, RowNumber
 from django.conf import settings
 from django.utils import timezone
 
 
+class EventQuerySet(models.QuerySet):
+    def with_remaining(self):
+        """
+        Annotate `tickets_sold` (tickets on confirmed bookings) and `remaining`
+        seats through a correlated subquery, so a whole page of events costs a
+        single query.
+        """
+        Booking = apps.get_model('guest', 'Booking')
+        sold = (
+            Booking.objects.filter(event=models.OuterRef('pk'), status='confirmed')
+            .order_by()
+            .values('event')
+            .annotate(total=models.Sum('ticket_quantity'))
+            .values('total')
+        )
+        return self.annotate(
+            tickets_sold=Coalesce(models.Subquery(sold), 0, output_field=models.IntegerField()),
+        ).annotate(
+            remaining=models.F('guest_count') - models.F('tickets_sold'),
+        )
+
+    def with_seats(self):
+        """Only events that still have seats left."""
+        return self.with_remaining().filter(remaining__gt=0)
+
+    def with_needs(self, needs, match='all'):
+        """
+        Events requiring all (or, with match='any', at least one) of the given
+        service codes, as a single bitwise predicate on needs_mask.
+        """
+        mask = needs_to_mask(needs)
+        if not mask:
+            return self
+        qs = self.alias(needs_matched=models.F('needs_mask').bitand(mask))
+        if match == 'any':
+            return qs.filter(needs_matched__gt=0)
+        return qs.filter(needs_matched=mask)
+
+    def search(self, text):
+        """Full-text match on name and venue_details (see host.search)."""
+        from .search import search_events
+        return search_events(self, text)
+
+
 class Event(models.Model):
     NEEDS_CHOICES = [
         ('catering', 'Catering'),
@@ -18,18 +68,87 @@ class Event(models.Model):
     end_date = models.DateTimeField()
     budget = models.DecimalField(max_digits=10, decimal_places=2)
     guest_count = models.PositiveIntegerField()
-    needs = models.CharField(max_length=255, blank=True)
+    # budget / guest_count, stored so the catalog can filter on it through an index
+    ticket_price = models.DecimalField(max_digits=10, decimal_places=2, default=0, editable=False)
+    # Required services as a bitmask over NEEDS_BITS; use needs_list to read/write codes
+    needs_mask = models.PositiveIntegerField(default=0)
    
     banner = models.ImageField(upload_to='events/', blank=True, null=True)
     venue_details = models.TextField(blank=True)
+    # True while the event has an accepted proposal; kept in sync by Proposal.save and host.signals.
+    # Guests see published events, planners see the unpublished (open) ones.
+    is_published = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = EventQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.name} by {self.host.username}"
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Covers the catalog range scan and lets needs_mask be tested from the index
+            models.Index(fields=['is_published', 'start_date', 'needs_mask'], name='event_published_start_needs'),
+            models.Index(fields=['is_published', 'ticket_price'], name='event_published_price'),
+            # Planner side: open (no accepted proposal) events in date order, without sorting
+            models.Index(fields=['start_date', 'id'], condition=models.Q(is_published=False), name='event_open_start'),
+            # Admin event list: newest first, optionally per host or per status
+            models.Index(fields=['-created_at', '-id'], name='event_created'),
+            models.Index(fields=['host', '-created_at', '-id'], name='event_host_created'),
+            models.Index(fields=['is_published', '-created_at', '-id'], name='event_published_created'),
+        ]
+
+    @property
+    def needs_list(self):
+        """Service codes for this event, in NEEDS_CHOICES order."""
+        return [code for code, _ in self.NEEDS_CHOICES if self.needs_mask & NEEDS_BITS[code]]
+
+    @needs_list.setter
+    def needs_list(self, codes):
+        self.needs_mask = needs_to_mask(codes)
+
+    @property
+    def needs_labels(self):
+        labels = dict(self.NEEDS_CHOICES)
+        return [labels[code] for code in self.needs_list]
+
+    def get_needs_display(self):
+        return ', '.join(self.needs_labels)
+
+    def save(self, *args, **kwargs):
+        if self.budget is not None and self.guest_count:
+            self.ticket_price = (Decimal(self.budget) / self.guest_count).quantize(Decimal('0.01'))
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'budget', 'guest_count'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'ticket_price'}
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def refresh_published(cls, event_id):
+        """Recompute is_published for one event from its proposals."""
+        cls.objects.filter(pk=event_id).update(
+            is_published=models.Exists(
+                Proposal.objects.filter(event=models.OuterRef('pk'), status='accepted')
+            )
+        )
+
+# One bit per service. Bits are persisted, so only ever append to NEEDS_CHOICES.
+NEEDS_BITS = {code: 1 << index for index, (code, _) in enumerate(Event.NEEDS_CHOICES)}
+
+
+def needs_to_mask(codes):
+    """Bitmask for an iterable of service codes; unknown codes are ignored."""
+    mask = 0
+    for code in codes or []:
+        mask |= NEEDS_BITS.get(code.strip(), 0)
+    return mask
+
+
+# Seconds a planner's dashboard stats are reused; proposal writes invalidate them sooner.
+PLANNER_STATS_CACHE_TTL = 300
+
 
 class Proposal(models.Model):
     STATUS_CHOICES = [
@@ -46,4 +165,212 @@ class Proposal(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f"Proposal for {self.event.name} by {self.planner.username}"
\ No newline at end of file
+        return f"Proposal for {self.event.name} by {self.planner.username}"
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        Event.refresh_published(self.event_id)
+        Proposal.invalidate_planner_stats(self.planner_id)
+
+    @classmethod
+    def ranked(cls, event_ids):
+        """
+        Proposals for the given events annotated with `rank` (1 = lowest
+        amount within its event) and `offers` (proposals for that event).
+        """
+        by_event = {'partition_by': models.F('event_id')}
+        return cls.objects.filter(event_id__in=event_ids).annotate(
+            rank=models.Window(RowNumber(), order_by=['amount', 'id'], **by_event),
+            offers=models.Window(models.Count('id'), **by_event),
+        )
+
+    @classmethod
+    def median_amounts(cls, event_ids):
+        """
+        Median proposal amount per event. The database returns only the one
+        or two middle rows of each event, so no event's offers are loaded.
+        """
+        middle = (
+            cls.ranked(event_ids)
+            .filter(
+                models.Q(rank=(models.F('offers') + 1) / 2)
+                | models.Q(rank=(models.F('offers') + 2) / 2)
+            )
+            .values_list('event_id', 'amount')
+        )
+        amounts = {}
+        for event_id, amount in middle:
+            amounts.setdefault(event_id, []).append(amount)
+        return {event_id: sum(values) / len(values) for event_id, values in amounts.items()}
+
+    @staticmethod
+    def _planner_stats_key(planner_id):
+        return f'planner:stats:{planner_id}'
+
+    @classmethod
+    def planner_stats(cls, planner_id):
+        """
+        Proposal counts and amounts per status for one planner, plus totals and
+        win rate (accepted share of decided proposals), from a single grouped
+        query. Cached until the planner's proposals change.
+        """
+        key = cls._planner_stats_key(planner_id)
+        stats = cache.get(key)
+        if stats is not None:
+            return stats
+
+        stats = {'total': 0, 'total_amount': Decimal('0')}
+        for status, _ in cls.STATUS_CHOICES:
+            stats[status] = 0
+            stats[f'{status}_amount'] = Decimal('0')
+
+        rows = (
+            cls.objects.filter(planner_id=planner_id)
+            .order_by()
+            .values('status')
+            .annotate(count=models.Count('id'), amount=models.Sum('amount'))
+        )
+        for row in rows:
+            stats[row['status']] = row['count']
+            stats[f"{row['status']}_amount"] = row['amount'] or Decimal('0')
+            stats['total'] += row['count']
+            stats['total_amount'] += row['amount'] or Decimal('0')
+
+        decided = stats['accepted'] + stats['rejected']
+        stats['win_rate'] = round(100 * stats['accepted'] / decided, 1) if decided else None
+        cache.set(key, stats, PLANNER_STATS_CACHE_TTL)
+        return stats
+
+    @classmethod
+    def invalidate_planner_stats(cls, *planner_ids):
+        """Drop cached dashboard stats; call after any write that bypasses save()."""
+        cache.delete_many([cls._planner_stats_key(planner_id) for planner_id in planner_ids])
+
+
+class CheckinCounter(models.Model):
+    """
+    Running check-in totals for an event: scans add admissions through
+    host.checkin.record_admissions, booking saves and deletes adjust it
+    through host.signals. reconcile_checkin_counters corrects any drift.
+    """
+    event = models.OneToOneField(Event, on_delete=models.CASCADE, primary_key=True, related_name='checkin_counter')
+    expected = models.IntegerField(default=0)  # tickets on confirmed bookings
+    admitted = models.IntegerField(default=0)  # tickets scanned in
+    admitted_bookings = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Check-in for {self.event_id}: {self.admitted}/{self.expected}"
+
+
+class CheckinMinute(models.Model):
+    """Number of successful scans for an event within one wall-clock minute."""
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='checkin_minutes')
+    minute = models.DateTimeField()
+    scans = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'minute'], name='unique_checkin_minute'),
+        ]
+
+    def __str__(self):
+        return f"{self.scans} scans for {self.event_id} at {self.minute}"
+
+
+# Lower bounds of the guest-count buckets used for price benchmarks
+GUEST_BUCKETS = [0, 50, 100, 250, 500, 1000]
+# Percentiles stored per benchmark: 0, 5, ..., 100
+BENCHMARK_PERCENTILES = list(range(0, 101, 5))
+
+
+def guest_bucket(guest_count):
+    """Lower bound of the GUEST_BUCKETS bucket containing `guest_count`."""
+    return GUEST_BUCKETS[max(bisect.bisect_right(GUEST_BUCKETS, guest_count or 0) - 1, 0)]
+
+
+class ProposalPriceBenchmark(models.Model):
+    """
+    Distribution of accepted proposal amounts for events with the same
+    needs and guest-count bucket. Rows with a NULL needs_mask are broader:
+    those with a `service` cover every event needing that service, the one
+    without covers the whole bucket. Rebuilt in batch by the
+    compute_price_benchmarks command.
+    """
+    needs_mask = models.PositiveIntegerField(null=True, blank=True)
+    # Service code of a per-service row; blank on exact-needs and bucket-wide rows
+    service = models.CharField(max_length=20, choices=Event.NEEDS_CHOICES, blank=True)
+    guest_bucket = models.PositiveIntegerField()
+    sample_size = models.PositiveIntegerField()
+    # Amounts at BENCHMARK_PERCENTILES, ascending
+    quantiles = models.JSONField()
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['guest_bucket', 'needs_mask'], name='price_benchmark_lookup'),
+        ]
+
+    def __str__(self):
+        scope = self.service or self.needs_mask
+        return f"Benchmark {scope}/{self.guest_bucket}+ ({self.sample_size} proposals)"
+
+    @property
+    def median(self):
+        return self.quantiles[len(self.quantiles) // 2]
+
+    @property
+    def lower_quartile(self):
+        return self.quantiles[len(self.quantiles) // 4]
+
+    @property
+    def upper_quartile(self):
+        return self.quantiles[3 * len(self.quantiles) // 4]
+
+    def percentile_of(self, amount):
+        """Percentile rank (0-100) of `amount` within this distribution, interpolated."""
+        amount = float(amount)
+        quantiles = self.quantiles
+        if amount <= quantiles[0]:
+            return 0
+        if amount >= quantiles[-1]:
+            return 100
+        index = bisect.bisect_right(quantiles, amount)
+        low, high = quantiles[index - 1], quantiles[index]
+        step = BENCHMARK_PERCENTILES[index] - BENCHMARK_PERCENTILES[index - 1]
+        fraction = (amount - low) / (high - low) if high > low else 0
+        return round(BENCHMARK_PERCENTILES[index - 1] + fraction * step)
+
+    @classmethod
+    def lookup(cls, events):
+        """
+        Map {key: (needs_mask, guest_count)} to {key: benchmark or None} with
+        one query. An exact needs match wins, then the largest per-service row
+        among the event's needs, then the bucket-wide row.
+        """
+        keys = {key: (mask, guest_bucket(guest_count)) for key, (mask, guest_count) in events.items()}
+        if not keys:
+            return {}
+        rows = {
+            (row.needs_mask, row.service, row.guest_bucket): row
+            for row in cls.objects.filter(
+                models.Q(needs_mask__in={mask for mask, _ in keys.values()}) | models.Q(needs_mask__isnull=True),
+                guest_bucket__in={bucket for _, bucket in keys.values()},
+            )
+        }
+        result = {}
+        for key, (mask, bucket) in keys.items():
+            by_service = [
+                rows[None, code, bucket] for code, bit in NEEDS_BITS.items()
+                if mask & bit and (None, code, bucket) in rows
+            ]
+            result[key] = (
+                rows.get((mask, '', bucket))
+                or max(by_service, key=lambda row: row.sample_size, default=None)
+                or rows.get((None, '', bucket))
+            )
+        return result
+
+    @classmethod
+    def for_event(cls, event):
+        return cls.lookup({event.pk: (event.needs_mask, event.guest_count)})[event.pk]
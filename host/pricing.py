@@ -0,0 +1,76 @@
+"""
+Batch computation of proposal price benchmarks.
+
+Accepted proposal amounts are grouped by the event's guest-count bucket
+and, within it, by the event's exact needs, by each single service it needs,
+and as one catch-all group, and the percentiles of every group are computed
+with NumPy. Exact combinations of needs are often too rare to reach
+MIN_SAMPLE_SIZE; the per-service groups give those events a closer match
+than the catch-all. Run the
+compute_price_benchmarks command periodically (e.g. nightly from cron).
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .models import BENCHMARK_PERCENTILES, GUEST_BUCKETS, NEEDS_BITS, Proposal, ProposalPriceBenchmark
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+# Groups with fewer accepted proposals than this get no row of their own
+MIN_SAMPLE_SIZE = 5
+
+# Stand in for NULL (all needs) and for per-service groups in the NumPy key
+# arrays; real masks are never negative
+ALL_NEEDS = -1
+SERVICE_KEYS = {-2 - index: code for index, code in enumerate(NEEDS_BITS)}
+
+
+def compute_price_benchmarks():
+    """Rebuild the ProposalPriceBenchmark table; returns the number of rows written."""
+    if np is None:
+        raise RuntimeError('NumPy is required to compute price benchmarks.')
+
+    rows = list(
+        Proposal.objects.filter(status='accepted')
+        .values_list('amount', 'event__needs_mask', 'event__guest_count')
+        .iterator()
+    )
+    computed_at = timezone.now()
+    benchmarks = []
+    if rows:
+        amounts = np.array([float(row[0]) for row in rows])
+        masks = np.array([row[1] for row in rows], dtype=np.int64)
+        buckets = np.asarray(GUEST_BUCKETS)[np.searchsorted(GUEST_BUCKETS, [row[2] for row in rows], side='right') - 1]
+
+        # Every proposal counts for its exact needs, for each service it needs and for the catch-all
+        copies = [(masks, buckets, amounts), (np.full(len(rows), ALL_NEEDS), buckets, amounts)]
+        for key, code in SERVICE_KEYS.items():
+            needed = (masks & NEEDS_BITS[code]) != 0
+            copies.append((np.full(int(needed.sum()), key), buckets[needed], amounts[needed]))
+        masks, buckets, amounts = (np.concatenate(parts) for parts in zip(*copies))
+
+        keys, group, sizes = np.unique(np.stack([masks, buckets], axis=1), axis=0, return_inverse=True, return_counts=True)
+        order = np.lexsort((amounts, group.ravel()))
+        sorted_amounts = amounts[order]
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+        for (mask, bucket), start, size in zip(keys.tolist(), starts.tolist(), sizes.tolist()):
+            if size < MIN_SAMPLE_SIZE:
+                continue
+            quantiles = np.percentile(sorted_amounts[start:start + size], BENCHMARK_PERCENTILES)
+            benchmarks.append(ProposalPriceBenchmark(
+                needs_mask=mask if mask >= 0 else None,
+                service=SERVICE_KEYS.get(mask, ''),
+                guest_bucket=bucket,
+                sample_size=size,
+                quantiles=np.round(quantiles, 2).tolist(),
+                computed_at=computed_at,
+            ))
+
+    with transaction.atomic():
+        ProposalPriceBenchmark.objects.all().delete()
+        ProposalPriceBenchmark.objects.bulk_create(benchmarks)
+    return len(benchmarks)
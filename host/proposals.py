@@ -0,0 +1,98 @@
+"""
+Accepting and rejecting proposals.
+
+An event can have only one accepted proposal. Decisions lock the affected
+events and use conditional UPDATEs. Two hosts' tabs racing to accept can
+therefore never both win. Once a proposal is accepted, every other pending
+proposal for its event is rejected in the same transaction. The planners
+involved are notified in bulk after commit.
+"""
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Q
+
+from adminpanel.activity import activity, log_activities
+from .models import Event, Proposal
+
+
+def decide_proposals(host, accept_ids=(), reject_ids=()):
+    """
+    Accept and reject proposals on `host`'s events in one transaction.
+
+    Accepts are tried in the order given; an accept for an event that already
+    has (or has just been given) an accepted proposal is skipped. Returns a
+    dict of accepted, rejected and skipped proposal ids. Rejected includes
+    the competing proposals rejected automatically.
+    """
+    accept_ids = list(dict.fromkeys(int(pk) for pk in accept_ids))
+    reject_ids = {int(pk) for pk in reject_ids} - set(accept_ids)
+    accepted, skipped = [], []
+
+    with transaction.atomic():
+        event_of = dict(
+            Proposal.objects.filter(pk__in=accept_ids, event__host=host).values_list('id', 'event_id')
+        )
+        # Lock the events so concurrent accepts for the same event run one after the other
+        closed = {
+            event_id
+            for event_id, is_published in Event.objects.select_for_update()
+            .filter(pk__in=set(event_of.values()))
+            .values_list('id', 'is_published')
+            if is_published
+        }
+
+        for proposal_id in accept_ids:
+            event_id = event_of.get(proposal_id)
+            if event_id is None or event_id in closed:
+                skipped.append(proposal_id)
+                continue
+            if Proposal.objects.filter(pk=proposal_id, status='pending').update(status='accepted'):
+                accepted.append(proposal_id)
+                closed.add(event_id)
+            else:
+                skipped.append(proposal_id)
+
+        won_events = {event_of[proposal_id] for proposal_id in accepted}
+        losers = dict(
+            Proposal.objects.select_for_update(of=('self',))
+            .filter(status='pending', event__host=host)
+            .filter(Q(event_id__in=won_events) | Q(pk__in=reject_ids))
+            .values_list('id', 'planner_id')
+        )
+        Proposal.objects.filter(pk__in=losers).update(status='rejected')
+        skipped = [proposal_id for proposal_id in skipped if proposal_id not in losers]
+        skipped.extend(proposal_id for proposal_id in reject_ids if proposal_id not in losers)
+
+        Event.objects.filter(pk__in=won_events).update(is_published=True)
+
+        planner_ids = set(losers.values()) | set(
+            Proposal.objects.filter(pk__in=accepted).values_list('planner_id', flat=True)
+        )
+        _log_decisions(host, accepted, losers)
+        transaction.on_commit(partial(_after_decisions, accepted, list(losers), planner_ids))
+
+    return {'accepted': accepted, 'rejected': list(losers), 'skipped': skipped}
+
+
+def _log_decisions(host, accepted, rejected):
+    accepted = set(accepted)
+    log_activities([
+        activity(
+            'proposal_accepted' if pk in accepted else 'proposal_rejected',
+            f'Proposal by {planner} for "{event}" {"accepted" if pk in accepted else "rejected"}',
+            actor_id=host.pk, object_id=pk,
+        )
+        for pk, planner, event in Proposal.objects.filter(pk__in=accepted | set(rejected))
+        .values_list('id', 'planner__username', 'event__name')
+    ])
+
+
+def _after_decisions(accepted, rejected, planner_ids):
+    # Bulk UPDATEs bypass Proposal.save and its signals, so do their work here
+    from notifications.signals import notify_proposal_decisions
+    from planner.recommend import apply_acceptances
+
+    Proposal.invalidate_planner_stats(*planner_ids)
+    apply_acceptances(accepted)
+    notify_proposal_decisions(accepted, rejected)
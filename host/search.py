@@ -0,0 +1,100 @@
+"""
+Full-text search over Event.name and Event.venue_details.
+
+SQLite keeps an external-content FTS5 table (host_event_fts) in sync with
+host_event through triggers; PostgreSQL uses a GIN index on a tsvector
+expression. Other backends fall back to icontains. The install/uninstall
+helpers are called from migrations.
+"""
+import re
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+SQLITE_FTS_INSTALL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS host_event_fts
+       USING fts5(name, venue_details, content='host_event', content_rowid='id')""",
+    """CREATE TRIGGER IF NOT EXISTS host_event_fts_ai AFTER INSERT ON host_event BEGIN
+           INSERT INTO host_event_fts(rowid, name, venue_details)
+           VALUES (new.id, new.name, new.venue_details);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS host_event_fts_ad AFTER DELETE ON host_event BEGIN
+           INSERT INTO host_event_fts(host_event_fts, rowid, name, venue_details)
+           VALUES ('delete', old.id, old.name, old.venue_details);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS host_event_fts_au AFTER UPDATE OF name, venue_details ON host_event BEGIN
+           INSERT INTO host_event_fts(host_event_fts, rowid, name, venue_details)
+           VALUES ('delete', old.id, old.name, old.venue_details);
+           INSERT INTO host_event_fts(rowid, name, venue_details)
+           VALUES (new.id, new.name, new.venue_details);
+       END""",
+    "INSERT INTO host_event_fts(host_event_fts) VALUES ('rebuild')",
+]
+
+SQLITE_FTS_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS host_event_fts_ai",
+    "DROP TRIGGER IF EXISTS host_event_fts_ad",
+    "DROP TRIGGER IF EXISTS host_event_fts_au",
+    "DROP TABLE IF EXISTS host_event_fts",
+]
+
+POSTGRES_TSVECTOR = "to_tsvector('english', coalesce(host_event.name, '') || ' ' || coalesce(host_event.venue_details, ''))"
+
+POSTGRES_FTS_INSTALL = [
+    f"CREATE INDEX IF NOT EXISTS host_event_fts_idx ON host_event USING GIN ({POSTGRES_TSVECTOR})",
+]
+
+POSTGRES_FTS_UNINSTALL = [
+    "DROP INDEX IF EXISTS host_event_fts_idx",
+]
+
+
+def _run(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def install_event_fts(apps, schema_editor):
+    """
+    Create (or re-create) the search structures. SQLite table rebuilds in
+    later migrations drop the triggers, so those migrations call this again.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_FTS_INSTALL)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_FTS_INSTALL)
+
+
+def uninstall_event_fts(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_FTS_UNINSTALL)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_FTS_UNINSTALL)
+
+
+def search_events(queryset, text):
+    """Filter an Event queryset to rows matching every word of `text`."""
+    words = re.findall(r'\w+', text or '')
+    if not words:
+        return queryset
+
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        # Prefix match on every word: "gala"* "beach"*
+        match = ' '.join(f'"{word}"*' for word in words)
+        return queryset.filter(
+            id__in=RawSQL('SELECT rowid FROM host_event_fts WHERE host_event_fts MATCH %s', [match])
+        )
+    if vendor == 'postgresql':
+        return queryset.extra(
+            where=[f"{POSTGRES_TSVECTOR} @@ plainto_tsquery('english', %s)"],
+            params=[' '.join(words)],
+        )
+
+    condition = Q()
+    for word in words:
+        condition &= Q(name__icontains=word) | Q(venue_details__icontains=word)
+    return queryset.filter(condition)
@@ -0,0 +1,58 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .checkin import adjust_checkin_counter, booking_checkin_state
+from .models import Event, Proposal
+
+# Booking fields the check-in counter depends on. Instances loaded with any of
+# them deferred are left to reconcile_checkin_counters, as in adminpanel.signals.
+BOOKING_CHECKIN_FIELDS = {'event', 'status', 'ticket_quantity', 'is_used'}
+UNKNOWN = object()
+
+
+@receiver(post_delete, sender=Proposal)
+def proposal_deleted(sender, instance, **kwargs):
+    # Unlike a delete() override, this also runs for queryset deletes and
+    # for cascades from a deleted planner
+    Event.refresh_published(instance.event_id)
+    Proposal.invalidate_planner_stats(instance.planner_id)
+
+
+@receiver(post_init, sender='guest.Booking')
+def remember_booking_checkin(sender, instance, **kwargs):
+    if instance.pk is None:
+        instance._checkin_state = None
+    elif BOOKING_CHECKIN_FIELDS & instance.get_deferred_fields():
+        instance._checkin_state = UNKNOWN
+    else:
+        instance._checkin_state = booking_checkin_state(instance)
+
+
+def _apply_checkin_change(old_state, new_state):
+    """Move a booking's contribution from old_state to new_state (None = not stored)."""
+    deltas = {}
+    for state, sign in ((old_state, -1), (new_state, 1)):
+        if state is None:
+            continue
+        event_id, expected, admitted, admitted_bookings = state
+        change = deltas.setdefault(event_id, [0, 0, 0])
+        change[0] += sign * expected
+        change[1] += sign * admitted
+        change[2] += sign * admitted_bookings
+    for event_id, (expected, admitted, admitted_bookings) in deltas.items():
+        adjust_checkin_counter(event_id, expected=expected, admitted=admitted, admitted_bookings=admitted_bookings)
+
+
+@receiver(post_save, sender='guest.Booking')
+def booking_saved_checkin(sender, instance, created, raw=False, **kwargs):
+    if raw or instance._checkin_state is UNKNOWN:
+        return
+    new_state = booking_checkin_state(instance)
+    _apply_checkin_change(None if created else instance._checkin_state, new_state)
+    instance._checkin_state = new_state
+
+
+@receiver(post_delete, sender='guest.Booking')
+def booking_deleted_checkin(sender, instance, **kwargs):
+    if instance._checkin_state is not UNKNOWN:
+        _apply_checkin_change(instance._checkin_state, None)
@@ -17,4 +17,11 @@ urlpatterns = [
     path('proposals/<int:pk>/accept/', views.accept_proposal, name='accept_proposal'),
     path('qr-scanner/', views.QRScannerView.as_view(), name='qr_scanner'),
     path('verify-qr/', views.verify_qr_code, name='verify_qr'),
+    path('verify-qr/batch/', views.verify_qr_batch, name='verify_qr_batch'),
+    path('events/<int:pk>/scan-manifest/', views.scan_manifest, name='scan_manifest'),
+    path('events/<int:pk>/checkin/', views.CheckinDashboardView.as_view(), name='checkin_dashboard'),
+    path('events/<int:pk>/checkin/status/', views.checkin_status, name='checkin_status'),
+    path('events/<int:pk>/attendees/export/', views.export_attendees, name='export_attendees'),
+    path('charts/daily/', views.host_daily_chart, name='daily_chart'),
+    path('events/<int:pk>/charts/daily/', views.event_daily_chart, name='event_daily_chart'),
 ]
\ No newline at end of file
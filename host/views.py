@@ -3,11 +3,13 @@ from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib import messages
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView, DetailView
 from django.urls import reverse_lazy
-from django.db.models import Q
-from .models import Event, Proposal
+from django.db.models import Count, Max, Min, Q, Sum
+from .models import Event, Proposal, ProposalPriceBenchmark
 from .forms import EventForm, ProposalAcceptForm
+from .proposals import decide_proposals
 from accounts.models import CustomUser
 from utils.pagination import paginate_queryset  # your global paginator
+from utils.export import EXPORT_FORMATS, filter_bookings, stream_bookings
 
 
 class HostRequiredMixin(UserPassesTestMixin):
@@ -98,19 +100,31 @@ class EventDetailView(LoginRequiredMixin, HostRequiredMixin, DetailView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        needs = self.object.needs
-        context["needs_list"] = needs.split(",") if needs else []
+        context["needs_list"] = self.object.needs_labels
         
-        # Get all confirmed bookings for this event
-        bookings = Booking.objects.filter(
-            event=self.object,
-            status='confirmed'
-        ).select_related('guest').order_by('-created_at')
-        
-        context['bookings'] = bookings
-        context['total_registered'] = bookings.count()
-        context['total_tickets_sold'] = sum(booking.ticket_quantity for booking in bookings)
-        context['total_revenue'] = sum(booking.total_amount for booking in bookings)
+        # Confirmed bookings for this event; totals come from one aggregate query
+        bookings = Booking.objects.filter(event=self.object, status='confirmed')
+        totals = bookings.aggregate(
+            registered=Count('id'),
+            tickets=Sum('ticket_quantity'),
+            revenue=Sum('total_amount'),
+        )
+        context['total_registered'] = totals['registered']
+        context['total_tickets_sold'] = totals['tickets'] or 0
+        context['total_revenue'] = totals['revenue'] or 0
+
+        # Attendee table: searchable, one keyset page at a time
+        query = self.request.GET.get('q', '').strip()
+        if query:
+            bookings = bookings.filter(
+                Q(guest__full_name__icontains=query) | Q(guest__email__icontains=query)
+            )
+        page_obj, page_bookings = paginate_queryset(
+            self.request, bookings.select_related('guest'), keyset=('-created_at', '-id')
+        )
+        context['bookings'] = page_bookings
+        context['page_obj'] = page_obj
+        context['q'] = query
         
         return context
 
@@ -152,44 +166,127 @@ class ProposalsView(LoginRequiredMixin, HostRequiredMixin, ListView):
     model = Proposal
     template_name = 'host/proposals.html'
     context_object_name = 'proposals'
+    # Lowest offers shown per event card; ?event=<id> lists all of them
+    proposals_per_event = 5
+
+    def get_event_id(self):
+        event_id = self.request.GET.get('event', '')
+        return int(event_id) if event_id.isdigit() else None
 
     def get_queryset(self):
         # Only proposals for events hosted by the current user
-        return Proposal.objects.filter(event__host=self.request.user).order_by('-created_at')
+        queryset = Proposal.objects.filter(event__host=self.request.user).order_by('-created_at')
+        event_id = self.get_event_id()
+        if event_id:
+            queryset = queryset.filter(event_id=event_id)
+        return queryset
+
+    def get_event_groups(self):
+        """
+        One row per event with proposals, most recent activity first, with
+        the offer count and amount range from a single grouped query.
+        """
+        return (
+            self.get_queryset()
+            .order_by()
+            .values('event', 'event__name', 'event__budget', 'event__start_date', 'event__needs_mask', 'event__guest_count')
+            .annotate(
+                count=Count('id'),
+                pending=Count('id', filter=Q(status='pending')),
+                min_amount=Min('amount'),
+                max_amount=Max('amount'),
+                latest=Max('created_at'),
+            )
+            .order_by('-latest', '-event')
+        )
+
+    def post(self, request, *args, **kwargs):
+        # Bulk accept/reject of the ticked proposals
+        action = request.POST.get('action')
+        ids = [pk for pk in request.POST.getlist('proposal_ids') if pk.isdigit()]
+        if action not in ('accepted', 'rejected') or not ids:
+            messages.warning(request, 'Select proposals and an action.')
+            return redirect('host:proposals')
+
+        if action == 'accepted':
+            result = decide_proposals(request.user, accept_ids=ids)
+        else:
+            result = decide_proposals(request.user, reject_ids=ids)
+        _decision_messages(request, result)
+        return redirect('host:proposals')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        queryset = self.get_queryset()
+        event_id = self.get_event_id()
+
+        if event_id:
+            # One event: paginate through all of its proposals
+            groups = list(self.get_event_groups())
+            page_obj, proposals = paginate_queryset(
+                self.request, self.get_queryset().select_related('planner').order_by('amount', 'id')
+            )
+            proposals_by_event = {event_id: list(proposals)}
+        else:
+            # Paginate the event groups, then load the lowest offers of each in one query
+            page_obj, groups = paginate_queryset(self.request, self.get_event_groups())
+            groups = list(groups)
+            proposals_by_event = {group['event']: [] for group in groups}
+            for proposal in (
+                Proposal.ranked(proposals_by_event)
+                .filter(rank__lte=self.proposals_per_event)
+                .select_related('planner')
+                .order_by('event_id', 'rank')
+            ):
+                proposals_by_event[proposal.event_id].append(proposal)
+
+        event_ids = [group['event'] for group in groups]
+        medians = Proposal.median_amounts(event_ids)
+        benchmarks = ProposalPriceBenchmark.lookup({
+            group['event']: (group['event__needs_mask'], group['event__guest_count']) for group in groups
+        })
+        for group in groups:
+            group['proposals'] = proposals_by_event.get(group['event'], [])
+            group['median_amount'] = medians.get(group['event'])
+            group['benchmark'] = benchmark = benchmarks[group['event']]
+            if benchmark:
+                for proposal in group['proposals']:
+                    proposal.price_percentile = benchmark.percentile_of(proposal.amount)
 
-        # Apply global pagination
-        page_obj, paginated_proposals = paginate_queryset(self.request, queryset)
         context['page_obj'] = page_obj
-        context['proposals'] = paginated_proposals  # override context_object_name with paginated results
-
+        context['event_groups'] = groups
+        context['selected_event'] = event_id
         return context
 
 from django.utils.http import urlencode
 
+def _decision_messages(request, result):
+    if result['accepted']:
+        messages.success(
+            request,
+            f"Accepted {len(result['accepted'])} proposal(s); competing proposals were rejected automatically."
+        )
+    if result['rejected'] and not result['accepted']:
+        messages.error(request, f"Rejected {len(result['rejected'])} proposal(s).")
+    if result['skipped']:
+        messages.warning(
+            request,
+            f"{len(result['skipped'])} proposal(s) were skipped: already processed, or their event already has an accepted proposal."
+        )
+
+@require_POST
 def accept_proposal(request, pk):
     proposal = get_object_or_404(Proposal, pk=pk, event__host=request.user)
-    status = request.GET.get('status', 'accepted')  # Default to accepted
-
-    if proposal.status != 'pending':  # Prevent re-approving
-        messages.warning(request, 'This proposal has already been processed.')
-        return redirect('host:proposals')
+    status = request.POST.get('status', 'accepted')  # Default to accepted
 
     if status == 'accepted':
-        proposal.status = 'accepted'
-        messages.success(request, f'Proposal for "{proposal.event.name}" has been accepted.')
+        result = decide_proposals(request.user, accept_ids=[proposal.pk])
     elif status == 'rejected':
-        proposal.status = 'rejected'
-        messages.error(request, f'Proposal for "{proposal.event.name}" has been rejected.')
+        result = decide_proposals(request.user, reject_ids=[proposal.pk])
     else:
         messages.warning(request, 'Invalid status.')
         return redirect('host:proposals')
 
-    proposal.save()
-    # Optionally: send notification/email to planner here
+    _decision_messages(request, result)
     return redirect('host:proposals')
 
 from django.views.decorators.csrf import csrf_exempt
@@ -197,15 +294,29 @@ from django.http import JsonResponse
 from guest.models import Booking  # Adjust import path if needed
 
 from django.views.generic import TemplateView
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import ensure_csrf_cookie
 
+# The scanner's fetch() calls send the csrftoken cookie as X-CSRFToken
+@method_decorator(ensure_csrf_cookie, name='dispatch')
 class QRScannerView(LoginRequiredMixin, HostRequiredMixin, TemplateView):
     template_name = 'host/qr_scanner.html'
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # Events the scanner can download an offline manifest for
+        context['events'] = Event.objects.filter(
+            host=self.request.user,
+            end_date__gte=timezone.now()
+        ).order_by('start_date')
+        return context
+
 
 from django.contrib.auth.decorators import login_required
 
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
+from django.db import transaction
 from django.http import JsonResponse
 from django.utils import timezone
 import json
@@ -271,10 +382,26 @@ def verify_qr_code(request):
                 'booking_id': str(booking.booking_id)
             }, status=200)
         
-        # Mark as used
-        booking.is_used = True
+        # Mark as used; the conditional update keeps two gates from admitting the same ticket,
+        # and commits with the counters so a failed counter write leaves the ticket unused
         booking.scanned_at = timezone.now()
-        booking.save(update_fields=['is_used', 'scanned_at'])
+        with transaction.atomic():
+            admitted = Booking.objects.filter(pk=booking.pk, is_used=False).update(
+                is_used=True, scanned_at=booking.scanned_at
+            )
+            if admitted:
+                booking.is_used = True
+                record_admissions([booking])
+        if not admitted:
+            return JsonResponse({
+                'success': False,
+                'already_used': True,
+                'message': '❌ Ticket already used',
+                'guest': booking.guest.full_name,
+                'event': booking.event.name,
+                'tickets': booking.ticket_quantity,
+                'booking_id': str(booking.booking_id)
+            }, status=200)
 
         local_time = timezone.localtime(booking.scanned_at)
         
@@ -293,3 +420,120 @@ def verify_qr_code(request):
             'success': False,
             'message': f'Server error: {str(e)}'
         }, status=200)
+
+
+from .checkin import MAX_BATCH_SCANS, apply_scan_batch, build_manifest, checkin_snapshot, record_admissions
+
+
+def scan_manifest(request, pk):
+    """GET endpoint returning the offline check-in manifest for one event."""
+    if not request.user.is_authenticated:
+        return JsonResponse({'success': False, 'message': 'Authentication required'}, status=401)
+    if request.user.role != 'host':
+        return JsonResponse({'success': False, 'message': 'Only hosts can download manifests'}, status=403)
+
+    event = get_object_or_404(Event, pk=pk, host=request.user)
+    return JsonResponse({'success': True, 'manifest': build_manifest(event)})
+
+
+@require_POST
+def verify_qr_batch(request):
+    """POST endpoint applying scans recorded while the scanner was offline."""
+    if not request.user.is_authenticated:
+        return JsonResponse({'success': False, 'message': 'Authentication required'}, status=401)
+    if request.user.role != 'host':
+        return JsonResponse({'success': False, 'message': 'Only hosts can verify tickets'}, status=403)
+
+    try:
+        scans = json.loads(request.body).get('scans')
+    except (ValueError, AttributeError):
+        scans = None
+    if not isinstance(scans, list):
+        return JsonResponse({'success': False, 'message': 'Expected a JSON body with a "scans" list'}, status=400)
+    if len(scans) > MAX_BATCH_SCANS:
+        return JsonResponse({
+            'success': False,
+            'message': f'At most {MAX_BATCH_SCANS} scans can be uploaded at once'
+        }, status=400)
+
+    result = apply_scan_batch(request.user, scans)
+    return JsonResponse({
+        'success': True,
+        'admitted': [str(booking.booking_id) for booking in result['admitted']],
+        'duplicates': result['duplicates'],
+        'invalid': result['invalid'],
+    }, status=200)
+
+
+class CheckinDashboardView(LoginRequiredMixin, HostRequiredMixin, DetailView):
+    model = Event
+    template_name = 'host/checkin_dashboard.html'
+
+    def get_queryset(self):
+        return Event.objects.filter(host=self.request.user)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['snapshot'] = checkin_snapshot(self.object)
+        return context
+
+
+def checkin_status(request, pk):
+    """
+    Current check-in figures for the live dashboard, polled every few seconds.
+    A short request instead of a held-open stream, so open dashboards don't
+    tie up WSGI workers.
+    """
+    if not request.user.is_authenticated or request.user.role != 'host':
+        return JsonResponse({'success': False, 'message': 'Only hosts can view check-in'}, status=403)
+    event = get_object_or_404(Event, pk=pk, host=request.user)
+    response = JsonResponse(checkin_snapshot(event))
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+from adminpanel.models import EventDailyStats, HostDailyStats
+from adminpanel.rollups import daily_series
+
+DAILY_CHART_METRICS = ['bookings', 'tickets', 'revenue', 'proposals']
+
+
+def _chart_days(request):
+    days = request.GET.get('days', '90')
+    return int(days) if days.isdigit() else 90
+
+
+def host_daily_chart(request):
+    """Daily series across the host's events, from the HostDailyStats rollup."""
+    if not request.user.is_authenticated or request.user.role != 'host':
+        return JsonResponse({'success': False, 'message': 'Only hosts can view charts'}, status=403)
+    return JsonResponse(daily_series(
+        HostDailyStats.objects.filter(host=request.user), DAILY_CHART_METRICS, _chart_days(request)
+    ))
+
+
+def event_daily_chart(request, pk):
+    """Daily series for one event, from the EventDailyStats rollup."""
+    if not request.user.is_authenticated or request.user.role != 'host':
+        return JsonResponse({'success': False, 'message': 'Only hosts can view charts'}, status=403)
+    event = get_object_or_404(Event, pk=pk, host=request.user)
+    return JsonResponse(daily_series(
+        EventDailyStats.objects.filter(event=event), DAILY_CHART_METRICS, _chart_days(request)
+    ))
+
+
+def export_attendees(request, pk):
+    """Stream the attendee list of one event as CSV or NDJSON."""
+    if not request.user.is_authenticated or request.user.role != 'host':
+        messages.warning(request, 'You must be a logged-in Host to access this page.')
+        return redirect('accounts:home')
+    event = get_object_or_404(Event, pk=pk, host=request.user)
+
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        export_format = 'csv'
+    params = request.GET.copy()
+    params.pop('event', None)  # always scoped to this event
+    params.pop('host', None)
+    bookings = filter_bookings(Booking.objects.filter(event=event), params).order_by('created_at', 'id')
+    return stream_bookings(bookings, export_format, f'attendees_event_{event.pk}')
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_event_match_notification_type'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('proposal_submitted', 'Proposal Submitted'), ('proposal_accepted', 'Proposal Accepted'), ('proposal_rejected', 'Proposal Rejected'), ('booking_created', 'New Booking'), ('event_created', 'New Event'), ('event_match', 'Matching Event'), ('general', 'General Alert')], max_length=20),
+        ),
+    ]
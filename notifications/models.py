@@ -7,8 +7,10 @@ class Notification(models.Model):
     TYPE_CHOICES = [
         ('proposal_submitted', 'Proposal Submitted'),
         ('proposal_accepted', 'Proposal Accepted'),
+        ('proposal_rejected', 'Proposal Rejected'),
         ('booking_created', 'New Booking'),
         ('event_created', 'New Event'),
+        ('event_match', 'Matching Event'),
         ('general', 'General Alert'),
     ]
     recipient = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notifications')
@@ -21,6 +23,9 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['recipient', '-created_at', '-id'], name='notification_recipient_created'),
+        ]
 
     def __str__(self):
         return f"{self.notification_type} for {self.recipient.username} - {self.created_at}"
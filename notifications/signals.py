@@ -1,12 +1,22 @@
+from datetime import timedelta
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Count
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
+from django.core.mail import send_mail, send_mass_mail
 from django.conf import settings
+from django.utils import timezone
 from .models import Notification
 
 User = get_user_model()
 
+# At most this many matching-event notifications per planner per window
+EVENT_MATCH_LIMIT = 10
+EVENT_MATCH_WINDOW = timedelta(hours=1)
+
 @receiver(post_save, sender='host.Proposal')
 def proposal_notification(sender, instance, created, **kwargs):
 
@@ -48,6 +58,45 @@ def proposal_notification(sender, instance, created, **kwargs):
             )
 
 
+def notify_proposal_decisions(accepted_ids, rejected_ids):
+    """
+    Tell planners their proposals were accepted or rejected, for decisions
+    made with bulk UPDATEs (see host.proposals). Notifications are inserted
+    in one batch and the acceptance e-mails share one SMTP connection.
+    """
+    from host.models import Proposal
+
+    accepted_ids = set(accepted_ids)
+    notifications, mails = [], []
+    proposals = Proposal.objects.filter(pk__in=accepted_ids | set(rejected_ids)).select_related('event__host', 'planner')
+    for proposal in proposals:
+        if proposal.pk in accepted_ids:
+            notifications.append(Notification(
+                recipient=proposal.planner,
+                notification_type='proposal_accepted',
+                message=f'Your proposal for "{proposal.event.name}" has been accepted by {proposal.event.host.full_name}!',
+                related_object_id=proposal.id,
+                related_model='host.proposal'
+            ))
+            mails.append((
+                'Proposal Accepted',
+                f'Congratulations! Contract secured for "{proposal.event.name}".',
+                settings.DEFAULT_FROM_EMAIL,
+                [proposal.planner.email],
+            ))
+        else:
+            notifications.append(Notification(
+                recipient=proposal.planner,
+                notification_type='proposal_rejected',
+                message=f'Your proposal for "{proposal.event.name}" was not selected.',
+                related_object_id=proposal.id,
+                related_model='host.proposal'
+            ))
+
+    Notification.objects.bulk_create(notifications, batch_size=500)
+    if mails:
+        send_mass_mail(mails, fail_silently=True)
+
 @receiver(post_save, sender='guest.Booking')
 def booking_notification(sender, instance, created, **kwargs):
     if created:
@@ -82,9 +131,60 @@ def booking_notification(sender, instance, created, **kwargs):
             fail_silently=True,
         )
 
+def notify_matching_planners(event_id):
+    """
+    Push a new event to approved planners offering any service it needs.
+    Planners come from the (service, planner) index, those already at
+    EVENT_MATCH_LIMIT in the window are skipped, and the rest get one
+    bulk-inserted notification each.
+    """
+    from host.models import Event
+    from planner.models import PlannerService
+
+    event = Event.objects.filter(pk=event_id, start_date__gt=timezone.now()).first()
+    if event is None or not event.needs_list:
+        return
+
+    planner_ids = set(
+        PlannerService.objects.filter(
+            service__in=event.needs_list,
+            planner__role='planner',
+            planner__is_approved=True,
+            planner__is_active=True,
+        ).values_list('planner_id', flat=True)
+    )
+    if not planner_ids:
+        return
+
+    saturated = {
+        row['recipient']
+        for row in Notification.objects.filter(
+            recipient__in=planner_ids,
+            notification_type='event_match',
+            created_at__gte=timezone.now() - EVENT_MATCH_WINDOW,
+        ).values('recipient').annotate(sent=Count('id')).filter(sent__gte=EVENT_MATCH_LIMIT)
+    }
+    message = f'New event "{event.name}" needs {event.get_needs_display()}. Budget: ₹{event.budget}'
+    Notification.objects.bulk_create(
+        [
+            Notification(
+                recipient_id=planner_id,
+                notification_type='event_match',
+                message=message,
+                related_object_id=event.id,
+                related_model='host.event',
+            )
+            for planner_id in planner_ids - saturated
+        ],
+        batch_size=500,
+    )
+
 @receiver(post_save, sender='host.Event')
 def event_notification(sender, instance, created, **kwargs):
     if created:
+        # Fan out to matching planners once the event is actually committed
+        transaction.on_commit(partial(notify_matching_planners, instance.pk))
+
         # Notify admin (superusers)
         for admin in User.objects.filter(is_superuser=True):
             Notification.objects.create(
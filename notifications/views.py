@@ -24,7 +24,7 @@ class NotificationListView(LoginRequiredMixin, ListView):
         context = super().get_context_data(**kwargs)
 
         queryset = context["notifications"]
-        page_obj, page_items = paginate_queryset(self.request, queryset)
+        page_obj, page_items = paginate_queryset(self.request, queryset, keyset=('-created_at', '-id'))
 
         context["page_obj"] = page_obj
         context["notifications"] = page_items
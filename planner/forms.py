@@ -1,5 +1,5 @@
 from django import forms
-from host.models import Proposal
+from host.models import Event, Proposal
 
 class ProposalForm(forms.ModelForm):
     services = forms.CharField(widget=forms.Textarea(attrs={'rows': 3}), help_text="List services offered (e.g., Catering + Decorations)")
@@ -21,4 +21,13 @@ class ProposalForm(forms.ModelForm):
     def __init__(self, *args, event=None, **kwargs):
         super().__init__(*args, **kwargs)
         if event:
-            self.instance.event = event
\ No newline at end of file
+            self.instance.event = event
+
+
+class PlannerServicesForm(forms.Form):
+    services = forms.MultipleChoiceField(
+        choices=Event.NEEDS_CHOICES,
+        widget=forms.CheckboxSelectMultiple,
+        required=False,
+        help_text="You will be notified when a new event needs any of these services.",
+    )
\ No newline at end of file
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from planner.models import PlannerProfile
+from planner.recommend import refresh_profiles
+
+
+class Command(BaseCommand):
+    help = 'Recompute planner profiles from their whole proposal history (corrects drift from bulk updates).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--planner', type=int, action='append', dest='planners',
+                            help='Only this planner id (repeatable); default is every planner with a profile.')
+
+    def handle(self, *args, **options):
+        planner_ids = options['planners'] or list(PlannerProfile.objects.values_list('planner_id', flat=True))
+        refresh_profiles(*planner_ids)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {len(planner_ids)} planner profile(s).'))
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('accounts', '0002_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlannerProfile',
+            fields=[
+                ('planner', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='planner_profile', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('proposals', models.PositiveIntegerField(default=0)),
+                ('wins', models.PositiveIntegerField(default=0)),
+                ('service_weights', models.JSONField(default=list)),
+                ('typical_amount', models.FloatField(blank=True, null=True)),
+                ('lead_days_mean', models.FloatField(blank=True, null=True)),
+                ('lead_days_std', models.FloatField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0001_planner_profile'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlannerService',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('service', models.CharField(choices=[('catering', 'Catering'), ('decorations', 'Decorations'), ('photography', 'Photography'), ('music', 'Music/DJ'), ('venue', 'Venue Setup'), ('other', 'Other')], max_length=20)),
+                ('planner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='planner_services', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('service', 'planner'), name='unique_planner_service')],
+            },
+        ),
+    ]
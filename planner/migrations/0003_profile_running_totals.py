@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:44
+
+from django.db import migrations, models
+
+
+def drop_profiles(apps, schema_editor):
+    # Existing profiles have no running totals; get_profile rebuilds each one on first use
+    apps.get_model('planner', 'PlannerProfile').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0002_planner_services'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='plannerprofile',
+            name='amount_total',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='plannerprofile',
+            name='lead_days_sq_total',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='plannerprofile',
+            name='lead_days_total',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='plannerprofile',
+            name='service_totals',
+            field=models.JSONField(default=list),
+        ),
+        migrations.RunPython(drop_profiles, migrations.RunPython.noop),
+    ]
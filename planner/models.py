@@ -1,3 +1,47 @@
+from django.conf import settings
 from django.db import models
 
+from host.models import Event
+
 # Create your models here.
+
+
+class PlannerProfile(models.Model):
+    """
+    Summary of a planner's proposal history, used to rank open events for
+    them (see planner.recommend). The *_total fields are running sums that
+    each proposal change adjusts; the fields below them are derived from the
+    sums for ranking.
+    """
+    planner = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='planner_profile')
+    proposals = models.PositiveIntegerField(default=0)
+    wins = models.PositiveIntegerField(default=0)
+    # Unnormalised service weights, aligned with Event.NEEDS_CHOICES
+    service_totals = models.JSONField(default=list)
+    amount_total = models.FloatField(default=0)
+    lead_days_total = models.FloatField(default=0)
+    lead_days_sq_total = models.FloatField(default=0)
+    # Preference per service, aligned with Event.NEEDS_CHOICES and summing to 1
+    service_weights = models.JSONField(default=list)
+    typical_amount = models.FloatField(null=True, blank=True)  # mean proposal amount
+    lead_days_mean = models.FloatField(null=True, blank=True)  # days between proposing and the event
+    lead_days_std = models.FloatField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Profile for planner {self.planner_id}: {self.wins}/{self.proposals} won"
+
+
+class PlannerService(models.Model):
+    """A service a planner offers; new events needing it are pushed to them."""
+    planner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='planner_services')
+    service = models.CharField(max_length=20, choices=Event.NEEDS_CHOICES)
+
+    class Meta:
+        constraints = [
+            # Service first: the index also answers "which planners offer X"
+            models.UniqueConstraint(fields=['service', 'planner'], name='unique_planner_service'),
+        ]
+
+    def __str__(self):
+        return f"{self.planner_id} offers {self.service}"
@@ -0,0 +1,167 @@
+"""
+"Best matches" ranking of open events for a planner.
+
+A PlannerProfile condenses the planner's proposals into service preferences
+(won proposals count fully, other bids at BID_WEIGHT), a typical amount and
+a typical lead time. It keeps running totals, so a proposal change is
+applied as that one proposal's contribution (apply_profile_changes) rather
+than by re-reading the planner's history; refresh_profiles and the
+rebuild_planner_profiles command recompute from scratch. Open events are
+then scored all at once over NumPy arrays. NumPy is optional: without it
+rank_events returns None and callers keep their date ordering.
+"""
+import math
+
+from django.db import transaction
+from django.utils import timezone
+
+from host.models import Event, NEEDS_BITS, Proposal
+from .models import PlannerProfile
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+SERVICE_WEIGHT = 0.6
+BUDGET_WEIGHT = 0.2
+LEAD_WEIGHT = 0.2
+
+# A proposal that was not accepted still says something about what the planner offers
+BID_WEIGHT = 0.25
+# Floor for the lead-time spread so a planner with one proposal does not get a needle-sharp curve
+MIN_LEAD_STD_DAYS = 7.0
+
+
+def proposal_contribution(status, amount, needs_mask, created_at, start_date):
+    """What one proposal adds to its planner's profile totals."""
+    weight = 1.0 if status == 'accepted' else BID_WEIGHT
+    lead = (start_date - created_at).total_seconds() / 86400
+    return {
+        'proposals': 1,
+        'wins': 1 if status == 'accepted' else 0,
+        'service_totals': [weight if needs_mask & NEEDS_BITS[code] else 0.0 for code, _ in Event.NEEDS_CHOICES],
+        'amount_total': float(amount),
+        'lead_days_total': lead,
+        'lead_days_sq_total': lead * lead,
+    }
+
+
+def _add(profile, contribution, sign):
+    for field in ('proposals', 'wins', 'amount_total', 'lead_days_total', 'lead_days_sq_total'):
+        setattr(profile, field, getattr(profile, field) + sign * contribution[field])
+    totals = profile.service_totals or [0.0] * len(Event.NEEDS_CHOICES)
+    profile.service_totals = [total + sign * value for total, value in zip(totals, contribution['service_totals'])]
+
+
+def _derive(profile):
+    """Fill the fields rank_events reads from the running totals."""
+    count = profile.proposals
+    total_weight = sum(profile.service_totals)
+    profile.service_weights = [
+        weight / total_weight if total_weight > 0 else 0.0 for weight in profile.service_totals
+    ]
+    if count:
+        profile.typical_amount = profile.amount_total / count
+        profile.lead_days_mean = profile.lead_days_total / count
+        profile.lead_days_std = math.sqrt(max(profile.lead_days_sq_total / count - profile.lead_days_mean ** 2, 0.0))
+    else:
+        profile.typical_amount = profile.lead_days_mean = profile.lead_days_std = None
+
+
+def refresh_profiles(*planner_ids):
+    """Rebuild the profiles of the given planners from all of their proposals."""
+    for planner_id in planner_ids:
+        profile = PlannerProfile(planner_id=planner_id)
+        for row in (
+            Proposal.objects.filter(planner_id=planner_id)
+            .values_list('status', 'amount', 'event__needs_mask', 'created_at', 'event__start_date')
+            .iterator()
+        ):
+            _add(profile, proposal_contribution(*row), 1)
+        _derive(profile)
+        profile.save()
+
+
+def apply_profile_changes(planner_id, removed=(), added=()):
+    """
+    Subtract the `removed` and add the `added` proposal contributions to a
+    planner's profile. Planners without a profile are skipped: get_profile
+    builds it from their history on first use.
+    """
+    with transaction.atomic():
+        profile = PlannerProfile.objects.select_for_update().filter(planner_id=planner_id).first()
+        if profile is None:
+            return
+        for contribution in removed:
+            _add(profile, contribution, -1)
+        for contribution in added:
+            _add(profile, contribution, 1)
+        _derive(profile)
+        profile.save()
+
+
+def apply_acceptances(proposal_ids):
+    """
+    Profile changes for proposals a bulk UPDATE just moved from pending to
+    accepted. Rejections need none: pending and rejected bids weigh the same.
+    """
+    for planner_id, amount, needs_mask, created_at, start_date in (
+        Proposal.objects.filter(pk__in=proposal_ids)
+        .values_list('planner_id', 'amount', 'event__needs_mask', 'created_at', 'event__start_date')
+    ):
+        apply_profile_changes(
+            planner_id,
+            removed=[proposal_contribution('pending', amount, needs_mask, created_at, start_date)],
+            added=[proposal_contribution('accepted', amount, needs_mask, created_at, start_date)],
+        )
+
+
+def get_profile(planner):
+    """The planner's profile, built on first use."""
+    try:
+        return planner.planner_profile
+    except PlannerProfile.DoesNotExist:
+        refresh_profiles(planner.pk)
+        return PlannerProfile.objects.get(planner=planner)
+
+
+def rank_events(profile, queryset):
+    """
+    Score every event in `queryset` for the planner and return
+    [(event_id, score), ...] best first, with score in 0..1. Ties keep the
+    queryset's own order. Returns None when NumPy is missing or the planner
+    has no history to go on.
+    """
+    if np is None or not profile.proposals:
+        return None
+
+    rows = list(queryset.values_list('id', 'needs_mask', 'budget', 'start_date'))
+    if not rows:
+        return []
+
+    now = timezone.now()
+    count = len(rows)
+    ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=count)
+    masks = np.fromiter((row[1] for row in rows), dtype=np.int64, count=count)
+    budgets = np.fromiter((float(row[2]) for row in rows), dtype=np.float64, count=count)
+    lead = np.fromiter(((row[3] - now).total_seconds() / 86400 for row in rows), dtype=np.float64, count=count)
+
+    # Services: share of the planner's preference covered by what the event needs
+    weights = np.asarray(profile.service_weights or [0.0] * len(NEEDS_BITS), dtype=np.float64)
+    needs = (masks[:, None] >> np.arange(len(weights))) & 1
+    service_score = needs @ weights
+
+    # Budget: 1 when the budget covers the planner's typical amount, less the further short it falls
+    if profile.typical_amount:
+        budget_score = np.clip(budgets / profile.typical_amount, 0.0, 1.0)
+    else:
+        budget_score = np.ones(count)
+
+    # Lead time: Gaussian around the planner's usual notice period
+    spread = max(profile.lead_days_std or 0.0, MIN_LEAD_STD_DAYS)
+    lead_score = np.exp(-0.5 * ((lead - profile.lead_days_mean) / spread) ** 2)
+
+    scores = SERVICE_WEIGHT * service_score + BUDGET_WEIGHT * budget_score + LEAD_WEIGHT * lead_score
+    order = np.argsort(-scores, kind='stable')
+    return list(zip(ids[order].tolist(), np.round(scores[order], 3).tolist()))
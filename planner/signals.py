@@ -0,0 +1,58 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from host.models import Event
+from .recommend import apply_profile_changes, proposal_contribution
+
+# Proposal fields a planner profile depends on. Instances loaded with any of
+# them deferred are left to the rebuild_planner_profiles command.
+PROFILE_FIELDS = {'planner', 'status', 'amount', 'event'}
+UNKNOWN = object()
+
+
+def _profile_state(proposal):
+    return (proposal.planner_id, proposal.status, proposal.amount, proposal.event_id)
+
+
+def _contribution(proposal, state):
+    _, status, amount, event_id = state
+    if event_id == proposal.event_id:
+        event = proposal.event
+    else:
+        event = Event.objects.only('needs_mask', 'start_date').get(pk=event_id)
+    return proposal_contribution(status, amount, event.needs_mask, proposal.created_at, event.start_date)
+
+
+@receiver(post_init, sender='host.Proposal')
+def remember_proposal_profile(sender, instance, **kwargs):
+    if instance.pk is None:
+        instance._profile_state = None
+    elif PROFILE_FIELDS & instance.get_deferred_fields():
+        instance._profile_state = UNKNOWN
+    else:
+        instance._profile_state = _profile_state(instance)
+
+
+@receiver(post_save, sender='host.Proposal')
+def proposal_changed(sender, instance, created, raw=False, **kwargs):
+    # Move this one proposal's contribution in the planner's profile
+    if raw or instance._profile_state is UNKNOWN:
+        return
+    old_state, new_state = (None if created else instance._profile_state), _profile_state(instance)
+    if old_state == new_state:
+        return
+    added = _contribution(instance, new_state)
+    if old_state is None or old_state[0] == new_state[0]:
+        apply_profile_changes(new_state[0], [_contribution(instance, old_state)] if old_state else [], [added])
+    else:
+        apply_profile_changes(old_state[0], removed=[_contribution(instance, old_state)])
+        apply_profile_changes(new_state[0], added=[added])
+    instance._profile_state = new_state
+
+
+@receiver(post_delete, sender='host.Proposal')
+def proposal_deleted(sender, instance, **kwargs):
+    # A cascade from the planner may have removed the profile already, which
+    # apply_profile_changes skips; a cascade from the event still has its row
+    if instance._profile_state is not UNKNOWN:
+        apply_profile_changes(instance.planner_id, removed=[_contribution(instance, instance._profile_state)])
@@ -5,6 +5,7 @@ app_name = 'planner'
 
 urlpatterns = [
     path('', views.PlannerDashboardView.as_view(), name='dashboard'),
+    path('services/', views.PlannerServicesView.as_view(), name='services'),
     path('available-events/', views.AvailableEventsView.as_view(), name='available_events'),
     path('events/<int:pk>/submit-proposal/', views.ProposalCreateView.as_view(), name='submit_proposal'),
     path('proposals/', views.ProposalListView.as_view(), name='proposal_list'),
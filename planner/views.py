@@ -1,14 +1,21 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib import messages
-from django.views.generic import ListView, CreateView, UpdateView, DeleteView, DetailView
+from django.views.generic import ListView, CreateView, UpdateView, DeleteView, DetailView, FormView
 from django.urls import reverse_lazy
 from django.utils import timezone
-from .forms import ProposalForm
+from .forms import ProposalForm, PlannerServicesForm
+from django.db import transaction
 from django.db.models import Q
-from host.models import Event, Proposal
+from host.models import Event, Proposal, ProposalPriceBenchmark
+from host.forms import NeedsFilterForm
+from .models import PlannerService
+from .recommend import get_profile, rank_events
 from utils.pagination import paginate_queryset  # your global paginator
 
+# Recent proposals listed on the planner dashboard; the full history is on the proposals page.
+DASHBOARD_RECENT_PROPOSALS = 5
+
 
 class PlannerRequiredMixin(UserPassesTestMixin):
     def test_func(self):
@@ -23,16 +30,21 @@ class PlannerDashboardView(LoginRequiredMixin, PlannerRequiredMixin, ListView):
     context_object_name = 'proposals'
 
     def get_queryset(self):
-        return Proposal.objects.filter(planner=self.request.user).order_by('-created_at')
+        return (
+            Proposal.objects.filter(planner=self.request.user)
+            .select_related('event')
+            .order_by('-created_at', '-id')[:DASHBOARD_RECENT_PROPOSALS]
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        context['stats'] = Proposal.planner_stats(self.request.user.pk)
         # Count of all future events that do NOT have an accepted proposal yet
+        # (is_published is the denormalized "has an accepted proposal" flag)
         open_events = Event.objects.filter(
+            is_published=False,
             start_date__gt=timezone.now()
-        ).exclude(
-            proposals__status='accepted'
-        ).distinct().count()
+        ).count()
         context['open_events_count'] = open_events
         return context
 
@@ -43,21 +55,62 @@ class AvailableEventsView(LoginRequiredMixin, PlannerRequiredMixin, ListView):
     # remove paginate_by because we're using custom pagination
 
     def get_queryset(self):
-        # Open future events without accepted proposal
-        return Event.objects.filter(
+        # Open future events without accepted proposal: one range scan on
+        # the (is_published, start_date, needs_mask) index
+        events = Event.objects.filter(
+            is_published=False,
             start_date__gt=timezone.now()
-        ).exclude(
-            proposals__status='accepted'
-        ).distinct().order_by('start_date')
+        ).order_by('start_date', 'id')
+        # Optional service filter, e.g. ?needs=catering&needs=music; planners match any by default
+        data = self.request.GET.copy()
+        data.setdefault('needs_match', 'any')
+        self.needs_form = NeedsFilterForm(data)
+        if self.needs_form.is_valid():
+            events = self.needs_form.filter_queryset(events)
+        return events
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         queryset = self.get_queryset()
-        page_obj, events = paginate_queryset(self.request, queryset)
+        sort = self.request.GET.get('sort', 'date')
+        ranked = rank_events(get_profile(self.request.user), queryset) if sort == 'best' else None
+        if ranked is None:
+            page_obj, events = paginate_queryset(self.request, queryset)
+        else:
+            # "Best matches": paginate the ranked ids, then load just this page
+            page_obj, page_ranked = paginate_queryset(self.request, ranked)
+            by_id = queryset.in_bulk([event_id for event_id, _ in page_ranked])
+            events = []
+            for event_id, score in page_ranked:
+                event = by_id[event_id]
+                event.match_score = round(score * 100)
+                events.append(event)
+            page_obj.object_list = events
         context['page_obj'] = page_obj
         context['events'] = events  # override context_object_name with paginated list
+        context['needs_form'] = self.needs_form
+        context['sort'] = 'best' if ranked is not None else 'date'
         return context
 
+class PlannerServicesView(LoginRequiredMixin, PlannerRequiredMixin, FormView):
+    form_class = PlannerServicesForm
+    template_name = 'planner/services_form.html'
+    success_url = reverse_lazy('planner:dashboard')
+
+    def get_initial(self):
+        return {'services': list(self.request.user.planner_services.values_list('service', flat=True))}
+
+    def form_valid(self, form):
+        chosen = set(form.cleaned_data['services'])
+        current = set(self.request.user.planner_services.values_list('service', flat=True))
+        with transaction.atomic():
+            self.request.user.planner_services.filter(service__in=current - chosen).delete()
+            PlannerService.objects.bulk_create(
+                [PlannerService(planner=self.request.user, service=code) for code in chosen - current]
+            )
+        messages.success(self.request, 'Your services have been updated.')
+        return super().form_valid(form)
+
 class ProposalCreateView(LoginRequiredMixin, PlannerRequiredMixin, CreateView):
     model = Proposal
     form_class = ProposalForm
@@ -70,7 +123,9 @@ class ProposalCreateView(LoginRequiredMixin, PlannerRequiredMixin, CreateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['event'] = get_object_or_404(Event, pk=self.kwargs['pk'])
+        context['event'] = event = get_object_or_404(Event, pk=self.kwargs['pk'])
+        # Accepted offers for similar events, to pitch the amount against
+        context['benchmark'] = ProposalPriceBenchmark.for_event(event)
         return context
 
     def form_valid(self, form):
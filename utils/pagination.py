@@ -1,14 +1,113 @@
+import base64
+import binascii
+import datetime
+import hashlib
+import json
+import re
+
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ValidationError
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
 
 # You can also import from Django settings for configurability
 DEFAULT_PER_PAGE = 7
 
-def paginate_queryset(request, queryset):
+# Seconds a row count is reused for the same query before recounting.
+COUNT_CACHE_TTL = 30
+# Above this many (estimated) rows, the planner's estimate is used instead of COUNT(*).
+COUNT_ESTIMATE_THRESHOLD = 100000
+# Page links shown either side of the current page, and at each end.
+PAGE_LINKS_ON_EACH_SIDE = 2
+PAGE_LINKS_ON_ENDS = 1
+
+
+def estimate_count(queryset):
+    """
+    Cheap row estimate from the query planner, or None when the backend has
+    no such thing (only PostgreSQL is supported).
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+            plan = cursor.fetchone()[0]
+    except DatabaseError:
+        return None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+# Only strings shaped like a full timestamp are treated as datetimes
+DATETIME_PARAM_RE = re.compile(r'^\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}')
+
+
+def _count_key_param(value):
+    """
+    Round datetime parameters (or their ISO strings, as SQLite backends
+    pass them) down to a COUNT_CACHE_TTL bucket. Lists filtered on
+    timezone.now() then share one cache key per bucket instead of missing
+    on every request; the count is at most one TTL stale either way.
+    """
+    if isinstance(value, str) and DATETIME_PARAM_RE.match(value):
+        try:
+            value = parse_datetime(value) or value
+        except ValueError:
+            pass
+    if isinstance(value, datetime.datetime):
+        return ('datetime', int(value.timestamp() // COUNT_CACHE_TTL))
+    return value
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator whose count is cached per normalized query for COUNT_CACHE_TTL
+    seconds, and estimated rather than counted for very large results.
+    """
+    count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        object_list = self.object_list
+        if not hasattr(object_list, 'query'):
+            return super().count
+
+        sql, params = object_list.order_by().query.sql_with_params()
+        params = tuple(_count_key_param(param) for param in params)
+        digest = hashlib.md5(repr((object_list.db, sql, params)).encode()).hexdigest()
+        key = f'pagination:count:{digest}'
+        cached = cache.get(key)
+        if cached is None:
+            estimate = estimate_count(object_list)
+            if estimate is not None and estimate >= COUNT_ESTIMATE_THRESHOLD:
+                cached = (estimate, True)
+            else:
+                cached = (object_list.count(), False)
+            cache.set(key, cached, COUNT_CACHE_TTL)
+
+        count, self.count_is_estimate = cached
+        return count
+
+
+def paginate_queryset(request, queryset, keyset=None):
     """
     Generic pagination function with a globally set items per page.
     Change DEFAULT_PER_PAGE here to update pagination everywhere.
+
+    Pass `keyset` (an ordering such as ('-created_at', '-id')) to opt a view
+    into cursor pagination via paginate_keyset instead of page numbers.
     """
-    paginator = Paginator(queryset, DEFAULT_PER_PAGE)
+    if keyset:
+        return paginate_keyset(request, queryset, ordering=keyset)
+
+    paginator = CachedCountPaginator(queryset, DEFAULT_PER_PAGE)
     page_number = request.GET.get('page')
 
     try:
@@ -18,4 +117,127 @@ def paginate_queryset(request, queryset):
     except EmptyPage:
         page_obj = paginator.page(paginator.num_pages)
 
-    return page_obj, page_obj.object_list
\ No newline at end of file
+    # Sliding window of page links for the pagination partial
+    page_obj.page_links = paginator.get_elided_page_range(
+        page_obj.number, on_each_side=PAGE_LINKS_ON_EACH_SIDE, on_ends=PAGE_LINKS_ON_ENDS
+    )
+    return page_obj, page_obj.object_list
+
+
+class KeysetPage:
+    """
+    One page from paginate_keyset. Unlike a Paginator page it knows nothing
+    about totals; it only carries cursors for the neighbouring pages.
+    """
+    is_keyset = True
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def _parse_ordering(queryset, ordering):
+    """Turn ('-created_at', 'id') into [(field_name, descending), ...]."""
+    opts = queryset.model._meta
+    fields = []
+    for item in ordering:
+        name = item.lstrip('-')
+        fields.append((opts.pk.name if name == 'pk' else name, item.startswith('-')))
+    return fields
+
+
+def _cursor_value(value):
+    # DjangoJSONEncoder truncates datetimes to milliseconds, which would make
+    # the cursor skip rows; keep full precision.
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (int, float, str, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def _encode_cursor(obj, fields):
+    values = [_cursor_value(getattr(obj, name)) for name, _ in fields]
+    raw = json.dumps(values).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _decode_cursor(cursor, queryset, fields):
+    """Return the ordering values stored in `cursor`, or None if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(fields):
+            return None
+        opts = queryset.model._meta
+        return [opts.get_field(name).to_python(value) for (name, _), value in zip(fields, values)]
+    except (binascii.Error, ValueError, FieldDoesNotExist, ValidationError):
+        return None
+
+
+def _seek_filter(fields, values, forward):
+    """Rows strictly after (forward) or before the cursor in the given ordering."""
+    condition = Q()
+    for index, (name, descending) in enumerate(fields):
+        lookup = 'lt' if descending == forward else 'gt'
+        clause = Q(**{f'{name}__{lookup}': values[index]})
+        for prev_index, (prev_name, _) in enumerate(fields[:index]):
+            clause &= Q(**{prev_name: values[prev_index]})
+        condition |= clause
+    return condition
+
+
+def paginate_keyset(request, queryset, ordering=('-created_at', '-id'), per_page=DEFAULT_PER_PAGE):
+    """
+    Seek-based pagination: pages are addressed by the ?after= / ?before=
+    cursors of a neighbouring page instead of a page number, so there is no
+    COUNT(*) and no OFFSET scan. `ordering` must be unique (end it with the
+    primary key), non-null and backed by an index for this to stay cheap.
+    Returns (page, object_list) like paginate_queryset.
+    """
+    fields = _parse_ordering(queryset, ordering)
+    after = request.GET.get('after')
+    before = request.GET.get('before')
+    after_values = _decode_cursor(after, queryset, fields) if after else None
+    before_values = _decode_cursor(before, queryset, fields) if before and not after_values else None
+
+    if before_values is not None:
+        reverse_ordering = [('' if descending else '-') + name for name, descending in fields]
+        rows = list(
+            queryset.filter(_seek_filter(fields, before_values, forward=False))
+            .order_by(*reverse_ordering)[:per_page + 1]
+        )
+        has_previous = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        has_next = True
+    else:
+        qs = queryset.order_by(*ordering)
+        if after_values is not None:
+            qs = qs.filter(_seek_filter(fields, after_values, forward=True))
+        rows = list(qs[:per_page + 1])
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+        has_previous = after_values is not None
+
+    page = KeysetPage(
+        rows,
+        next_cursor=_encode_cursor(rows[-1], fields) if rows and has_next else None,
+        previous_cursor=_encode_cursor(rows[0], fields) if rows and has_previous else None,
+    )
+    return page, page.object_list